@@ -39,7 +39,9 @@ class ApiConstruct(Construct):
         get_albums_function: _lambda.Function, 
         add_to_history_function: _lambda.Function,
         get_transcription_function: _lambda.Function,
-        get_feed_function: _lambda.Function
+        get_feed_function: _lambda.Function,
+        init_upload_function: _lambda.Function,
+        finalize_upload_function: _lambda.Function
     ):
         super().__init__(scope, id)
         
@@ -70,6 +72,8 @@ class ApiConstruct(Construct):
         self.add_to_history_function = add_to_history_function
         self.get_transcription_function = get_transcription_function
         self.get_feed_function = get_feed_function
+        self.init_upload_function = init_upload_function
+        self.finalize_upload_function = finalize_upload_function
         
 
         print(f"Creating API Gateway with discover endpoints...")
@@ -379,6 +383,35 @@ class ApiConstruct(Construct):
             ]
         )
 
+        # Direct-to-S3 upload: POST /music-content/upload issues presigned forms,
+        # POST /music-content/upload/finalize records the item once files are in S3
+        upload_resource = music_content_resource.add_resource('upload')
+        upload_resource.add_method(
+            'POST',
+            apigateway.LambdaIntegration(self.init_upload_function),
+            authorizer=authorizer,
+            method_responses=[
+                apigateway.MethodResponse(status_code='200'),
+                apigateway.MethodResponse(status_code='400'),
+                apigateway.MethodResponse(status_code='403'),
+                apigateway.MethodResponse(status_code='500')
+            ]
+        )
+
+        finalize_upload_resource = upload_resource.add_resource('finalize')
+        finalize_upload_resource.add_method(
+            'POST',
+            apigateway.LambdaIntegration(self.finalize_upload_function),
+            authorizer=authorizer,
+            method_responses=[
+                apigateway.MethodResponse(status_code='201'),
+                apigateway.MethodResponse(status_code='400'),
+                apigateway.MethodResponse(status_code='403'),
+                apigateway.MethodResponse(status_code='409'),
+                apigateway.MethodResponse(status_code='500')
+            ]
+        )
+
         music_content_resource.add_method(
             'PUT',
             apigateway.LambdaIntegration(self.update_music_content_function),
@@ -19,6 +19,12 @@ class DatabaseConstruct(Construct):
         print(f"Creating Artists table...")
         self.artists_table = self._create_artists_table()
 
+        print(f"Creating Artist names table...")
+        self.artist_names_table = self._create_artist_names_table()
+
+        print(f"Creating Genre registry table...")
+        self.genre_registry_table = self._create_genre_registry_table()
+
         print(f"Creating Albums table...")
         self.albums_table = self._create_albums_table()
 
@@ -117,6 +123,57 @@ class DatabaseConstruct(Construct):
         
         print("Artists table created with name and primaryGenre indexes for optimal discover performance")
         return table
+
+    def _create_artist_names_table(self) -> dynamodb.Table:
+        """
+        Artist name registry - one item per artist name, matched exactly like name-index
+        PERFORMANCE OPTIMIZATION: Name uniqueness is enforced by a conditional write
+        in the same transaction as the artist put, so concurrent requests cannot
+        both claim a name. create_artist backfills the names of artists created
+        earlier once, then marks the table with a ' backfilled' item
+        """
+        
+        table = dynamodb.Table(
+            self,
+            "ArtistNamesTable",
+            table_name=f"{self.config.app_name}-ArtistNames",
+            partition_key=dynamodb.Attribute(
+                name='name',
+                type=dynamodb.AttributeType.STRING
+            ),
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            removal_policy=RemovalPolicy.DESTROY
+        )
+        
+        print("Artist names table created for unique artist names")
+        return table
+
+    def _create_genre_registry_table(self) -> dynamodb.Table:
+        """
+        Genre registry - one item per (entity type, genre) pair in use
+        PERFORMANCE OPTIMIZATION: The create Lambdas register each genre they write,
+        so discover lists genres from this handful of items instead of scanning
+        the music content, artists and albums tables
+        """
+        
+        table = dynamodb.Table(
+            self,
+            "GenreRegistryTable",
+            table_name=f"{self.config.app_name}-GenreRegistry",
+            partition_key=dynamodb.Attribute(
+                name='entityType',
+                type=dynamodb.AttributeType.STRING
+            ),
+            sort_key=dynamodb.Attribute(
+                name='genre',
+                type=dynamodb.AttributeType.STRING
+            ),
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            removal_policy=RemovalPolicy.DESTROY
+        )
+        
+        print("Genre registry table created for genre listing")
+        return table
     
     def _create_albums_table(self) -> dynamodb.Table:
         """
@@ -188,10 +245,25 @@ class DatabaseConstruct(Construct):
             projection_type=dynamodb.ProjectionType.ALL
         )
         
+        # PERFORMANCE OPTIMIZATION 4: Active albums newest-first without a table scan
+        table.add_global_secondary_index(
+            index_name='status-createdAt-index',
+            partition_key=dynamodb.Attribute(
+                name='status',
+                type=dynamodb.AttributeType.STRING
+            ),
+            sort_key=dynamodb.Attribute(
+                name='createdAt',
+                type=dynamodb.AttributeType.STRING
+            ),
+            projection_type=dynamodb.ProjectionType.ALL
+        )
+        
         print("Albums table created with optimized indexes for discover functionality:")
         print("- genre-createdAt-index: Fast genre filtering with chronological order")
         print("- artistId-createdAt-index: Efficient artist album queries")
         print("- genre-artistId-index: Genre + artist drill-down")
+        print("- status-createdAt-index: Paginated listing of active albums")
         
         return table
     
@@ -328,6 +400,20 @@ class DatabaseConstruct(Construct):
             projection_type=dynamodb.ProjectionType.ALL
         )
 
+        # Duplicate check on create - one user's subscriptions of one type
+        table.add_global_secondary_index(
+            index_name='username-subscriptionType-index',
+            partition_key=dynamodb.Attribute(
+                name='username',
+                type=dynamodb.AttributeType.STRING
+            ),
+            sort_key=dynamodb.Attribute(
+                name='subscriptionType',
+                type=dynamodb.AttributeType.STRING
+            ),
+            projection_type=dynamodb.ProjectionType.INCLUDE,
+            non_key_attributes=['targetId', 'targetName']
+        )
         
         print("Subscriptions table created with album subscription support")
         return table
@@ -81,11 +81,10 @@ def is_admin_user(event):
         request_context = event.get('requestContext', {})
         authorizer = request_context.get('authorizer', {})
         
-        # Check if user is in administrators group
-        groups = authorizer.get('groups', '').split(',')
-        role = authorizer.get('role', '')
-        
-        return 'administrators' in groups or role == 'admin'
+        # Role is a single string compare - only split the groups list when it is not admin
+        if authorizer.get('role') == 'admin':
+            return True
+        return 'administrators' in authorizer.get('groups', '').split(',')
         
     except Exception as e:
         print(f"Error checking admin role: {str(e)}")
@@ -82,8 +82,10 @@ def generate_policy(user_info, method_arn):
     
     # Extract the API Gateway ARN parts and create a wildcard resource
     # method_arn format: arn:aws:execute-api:region:account:api-id/stage/METHOD/resource-path
-    arn_parts = method_arn.split('/')
-    if len(arn_parts) >= 3:
+    # Only the api-id/stage prefix is needed, so stop splitting after it;
+    # a stage-wide resource lets API Gateway reuse the cached policy for every route
+    arn_parts = method_arn.split('/', 2)
+    if len(arn_parts) == 3:
         # Create wildcard resource: arn:aws:execute-api:region:account:api-id/stage/*/*
         base_arn = '/'.join(arn_parts[:2])  # arn:aws:execute-api:region:account:api-id/stage
         wildcard_resource = f"{base_arn}/*/*"
@@ -8,12 +8,13 @@ import decimal
 import logging
 
 dynamodb = boto3.resource('dynamodb')
-s3_client = boto3.client('s3')
-lambda_client = boto3.client('lambda')
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Telo uspešnog odgovora je uvek isto - serijalizujemo ga jednom
+_OK_BODY = json.dumps('OK')
+
 def handler(event, context):
     try:
         request_context = event.get('requestContext', {})
@@ -43,7 +44,7 @@ def handler(event, context):
         return {
             'statusCode': 200,
             'headers': get_cors_headers(),
-            'body': json.dumps('OK')
+            'body': _OK_BODY
         }
 
         
@@ -68,48 +69,54 @@ def get_feed_albums(subscriptions, ratings, history, albums, content):
         Lista albuma sortiranih po afinitetu (opadajuće)
     """
     
-    subscription_boost = {}
-
+    # Pretplate svodimo na brojače, pa boost za album dobijamo jednim lookup-om
+    artist_subscriptions = Counter()
+    genre_subscriptions = Counter()
     for sub in subscriptions:
         if sub['subscriptionType'] == 'ARTIST':
-            for album in albums:
-                if album['artistId'] == sub.get('artistId'):
-                    subscription_boost[album['albumId']] = subscription_boost.get(album['albumId'], 0) + 50
-                    
+            artist_subscriptions[sub.get('artistId')] += 1
         elif sub['subscriptionType'] == 'GENRE':
-            for album in albums:
-                if album['genre'].lower() == sub['targetName'].lower():
-                    subscription_boost[album['albumId']] = subscription_boost.get(album['albumId'], 0) + 30
-    
+            genre_subscriptions[sub['targetName'].lower()] += 1
+
     song_ratings = {rating['songId']: int(rating['stars']) for rating in ratings}
 
+    # Pesme grupisane po albumu - jedan prolaz kroz content umesto jednog po albumu
+    songs_by_album = defaultdict(list)
+    for song in content:
+        songs_by_album[song.get("albumId")].append(song)
+
+    # Running sum/count po albumu, žanru i izvođaču - proseci u jednom prolazu
+    subscription_boost = {}
+    album_sum, album_cnt = Counter(), Counter()
+    genre_sum, genre_cnt = Counter(), Counter()
+    artist_sum, artist_cnt = Counter(), Counter()
 
-    album_ratings = defaultdict(list)
-    genre_affinity = defaultdict(list)
-    artist_affinity = defaultdict(list)
-    
     for album in albums:
-        album_song_ratings = []
-        for song in [item for item in content if item.get("albumId") == album['albumId']]:
-            if song.get('contentId') in song_ratings:
-                rating = song_ratings[song['contentId']]
-                album_song_ratings.append(rating)
-                genre_affinity[album['genre']].append(rating)
-                artist_affinity[album['artistId']].append(rating)
-    
-    if album_song_ratings:
-        album_ratings[album['albumId']] = sum(album_song_ratings) / len(album_song_ratings)
-    
+        album_id = album['albumId']
+        genre = album['genre']
+        artist_id = album['artistId']
+
+        boost = artist_subscriptions[artist_id] * 50
+        if genre_subscriptions:
+            boost += genre_subscriptions[genre.lower()] * 30
+        if boost:
+            subscription_boost[album_id] = subscription_boost.get(album_id, 0) + boost
+
+        for song in songs_by_album.get(album_id, ()):
+            rating = song_ratings.get(song.get('contentId'))
+            if rating is None:
+                continue
+            album_sum[album_id] += rating
+            album_cnt[album_id] += 1
+            genre_sum[genre] += rating
+            genre_cnt[genre] += 1
+            artist_sum[artist_id] += rating
+            artist_cnt[artist_id] += 1
+
+    album_ratings = {a: album_sum[a] / album_cnt[a] for a in album_cnt}
+    avg_genre_ratings = {g: genre_sum[g] / genre_cnt[g] for g in genre_cnt}
+    avg_artist_ratings = {a: artist_sum[a] / artist_cnt[a] for a in artist_cnt}
 
-    avg_genre_ratings = {}
-    for genre, ratings_list in genre_affinity.items():
-        avg_genre_ratings[genre] = sum(ratings_list) / len(ratings_list)
-    
-    avg_artist_ratings = {}
-    for artist_id, ratings_list in artist_affinity.items():
-        avg_artist_ratings[artist_id] = sum(ratings_list) / len(ratings_list)
-    
-    
 
     now = datetime.now()
     recent_threshold = now - timedelta(days=30)  # Skorašnja istorija
@@ -140,8 +147,14 @@ def get_feed_albums(subscriptions, ratings, history, albums, content):
     
     
     album_scores = {}
-    
-    
+
+    # Ne zavise od albuma - računamo ih jednom pre petlje
+    hour_prefs = hourly_genre_preferences.get(current_hour, {})
+    recent_boost_genres = {
+        g for g, count in genre_frequency.items()
+        if recent_genre_frequency.get(g, 0) > count * 0.3
+    }
+
     for album in albums:
         
         score = 0
@@ -179,11 +192,11 @@ def get_feed_albums(subscriptions, ratings, history, albums, content):
         total_artist_plays = artist_frequency.get(artist_id, 0) + recent_artist_frequency.get(artist_id, 0)
         score += min(total_artist_plays * 3, 40)  
         
-        if genre in hourly_genre_preferences.get(current_hour, {}):
-            time_preference = hourly_genre_preferences[current_hour][genre]
+        time_preference = hour_prefs.get(genre, 0)
+        if time_preference:
             score += min(time_preference * 5, 25) 
         
-        if recent_genre_frequency[genre] > genre_frequency[genre] * 0.3:
+        if genre in recent_boost_genres:
             score += 15  
         
         if genre in avg_genre_ratings and avg_genre_ratings[genre] < 2:
@@ -4,12 +4,15 @@ import uuid
 import os
 from datetime import datetime
 import logging
+from shared.utils import normalize_genre, register_genres
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 dynamodb = boto3.resource('dynamodb')
 
+_json_encoder = json.JSONEncoder(default=str, separators=(',', ':'))
+
 def handler(event, context):
     """
     Create Album Handler
@@ -53,6 +56,9 @@ def handler(event, context):
         # Update artist metadata
         update_artist_album_count(body['artistId'])
         
+        # Make the genre listable by discover
+        register_genres(dynamodb.Table(os.environ['GENRE_REGISTRY_TABLE']), 'album', [album_data['genre']])
+        
         logger.info(f"Album created successfully: {album_id}")
         
         return create_success_response(201, {
@@ -76,10 +82,10 @@ def is_admin_user(event):
         request_context = event.get('requestContext', {})
         authorizer = request_context.get('authorizer', {})
         
-        groups = authorizer.get('groups', '').split(',')
-        role = authorizer.get('role', '')
-        
-        return 'administrators' in groups or role == 'admin'
+        # Role is a single string compare - only split the groups list when it is not admin
+        if authorizer.get('role') == 'admin':
+            return True
+        return 'administrators' in authorizer.get('groups', '').split(',')
         
     except Exception as e:
         logger.error(f"Error checking admin role: {str(e)}")
@@ -152,33 +158,6 @@ def verify_artist_exists(artist_id):
         logger.error(f"Error verifying artist: {str(e)}")
         return False
 
-def normalize_genre(genre):
-    """DISCOVER OPTIMIZATION: Normalize genre names for consistent filtering"""
-    if not genre or not isinstance(genre, str):
-        return 'unknown'
-    
-    normalized = genre.lower().strip()
-    
-    # Handle common variations and typos
-    genre_mappings = {
-        'r&b': 'rnb',
-        'rhythm and blues': 'rnb',
-        'hip-hop': 'hiphop',
-        'hip hop': 'hiphop',
-        'drum and bass': 'drumnbass',
-        'drum & bass': 'drumnbass',
-        'electronic dance music': 'edm',
-        'singer-songwriter': 'singersongwriter',
-        'alt-rock': 'alternative',
-        'alternative rock': 'alternative',
-        'heavy metal': 'metal',
-        'death metal': 'metal',
-        'black metal': 'metal',
-        'thrash metal': 'metal'
-    }
-    
-    return genre_mappings.get(normalized, normalized)
-
 def create_album_record(album_id, input_data):
     """Create album record structure with discover optimizations"""
     
@@ -193,6 +172,7 @@ def create_album_record(album_id, input_data):
         'artistId': input_data['artistId'],
         'genre': normalized_genre,  # DISCOVER OPTIMIZATION
         'trackCount': len(input_data.get('tracksIds', [])),
+        'status': 'active',  # Partition key of status-createdAt-index
         'createdAt': current_time,
         'tracksIds': input_data['tracksIds']
     }
@@ -240,7 +220,7 @@ def create_success_response(status_code, data):
     return {
         'statusCode': status_code,
         'headers': get_cors_headers(),
-        'body': json.dumps(data, default=str)
+        'body': _json_encoder.encode(data)
     }
 
 def create_error_response(status_code, message, details=None):
@@ -255,7 +235,7 @@ def create_error_response(status_code, message, details=None):
     return {
         'statusCode': status_code,
         'headers': get_cors_headers(),
-        'body': json.dumps(error_data)
+        'body': _json_encoder.encode(error_data)
     }
 
 def get_cors_headers():
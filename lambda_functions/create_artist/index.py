@@ -1,14 +1,43 @@
 import json
 import boto3
-import uuid
+from botocore.config import Config
+from botocore.exceptions import ClientError
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
+from shared.utils import emit_count_metric, normalize_genre, register_genres, uuid7
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-dynamodb = boto3.resource('dynamodb')
+dynamodb = boto3.resource(
+    'dynamodb',
+    config=Config(tcp_keepalive=True, retries={'mode': 'standard', 'max_attempts': 2})
+)
+artists_table = dynamodb.Table(os.environ['ARTISTS_TABLE'])
+artist_names_table = dynamodb.Table(os.environ['ARTIST_NAMES_TABLE'])
+genre_registry_table = dynamodb.Table(os.environ['GENRE_REGISTRY_TABLE'])
+
+# Written once every artist created before ArtistNames existed has a name
+# reservation. Stored names are stripped, so no artist can claim this one
+ARTIST_NAMES_BACKFILL_MARKER = {'name': ' backfilled'}
+# Set once this container has seen the marker - warm requests skip the check
+_NAME_RESERVATIONS = {'backfilled': False}
+
+_json_encoder = json.JSONEncoder(default=str, separators=(',', ':'))
+
+_CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization,X-Requested-With',
+    'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
+    'Content-Type': 'application/json'
+}
+
+if os.environ.get('AWS_LAMBDA_INITIALIZATION_TYPE') == 'provisioned-concurrency':
+    try:
+        dynamodb.meta.client.describe_table(TableName=artists_table.name)
+    except Exception as e:
+        logger.warning("Warm-up failed: %s", e)
 
 def handler(event, context):
     """
@@ -17,37 +46,40 @@ def handler(event, context):
     DISCOVER OPTIMIZATION: Sets primaryGenre for efficient genre-based queries
     """
     
-    logger.info("Create artist request received")
+    # One timestamp for the whole request - record fields and responses share it
+    now_iso = datetime.now(timezone.utc).isoformat()
     
     try:
-        # Check authorization
-        if not is_admin_user(event):
-            return create_error_response(403, "Access denied. Administrator role required.")
+        # Check authorization - 'groups' is the comma-separated list set by the authorizer
+        authorizer = (event.get('requestContext') or {}).get('authorizer') or {}
+        if authorizer.get('role') != 'admin' and ',administrators,' not in f",{authorizer.get('groups') or ''},":
+            return create_error_response(403, "Access denied. Administrator role required.", timestamp=now_iso)
         
         # Parse request body
         if not event.get('body'):
-            return create_error_response(400, "Request body is required")
+            return create_error_response(400, "Request body is required", timestamp=now_iso)
         
         body = json.loads(event['body'])
         
         # Validate input
         validation_result = validate_artist_input(body)
         if not validation_result['is_valid']:
-            return create_error_response(400, "Validation failed", validation_result['errors'])
-        
-        # Check if artist with same name already exists
-        if check_artist_name_exists(body['name']):
-            return create_error_response(409, "Artist with this name already exists")
+            return create_error_response(400, "Validation failed", validation_result['errors'], timestamp=now_iso)
         
         # Create artist
-        artist_id = str(uuid.uuid4())
-        artist_data = create_artist_record(artist_id, body, event)
+        artist_id = uuid7()
+        artist_data = create_artist_record(artist_id, body, event, now_iso)
+        
+        # Store in DynamoDB - fails if artist with same name already exists
+        ensure_name_reservations()
+        if not store_artist(artist_data):
+            return create_error_response(409, "Artist with this name already exists", timestamp=now_iso)
         
-        # Store in DynamoDB
-        store_artist(artist_data)
+        register_genres(genre_registry_table, 'artist', artist_data['genres'])
         
-        logger.info(f"Artist created successfully: {artist_id}")
+        logger.info("Artist created successfully: %s", artist_id)
         
+        emit_count_metric('ArtistCreated')
         return create_success_response(201, {
             'message': 'Artist created successfully',
             'artist': {
@@ -59,25 +91,9 @@ def handler(event, context):
             }
         })
         
-    except Exception as e:
-        logger.error(f"Create artist error: {str(e)}")
-        return create_error_response(500, "Internal server error")
-
-def is_admin_user(event):
-    """Check if the user has administrator role"""
-    try:
-        request_context = event.get('requestContext', {})
-        authorizer = request_context.get('authorizer', {})
-        
-        # Check if user is in administrators group
-        groups = authorizer.get('groups', '').split(',')
-        role = authorizer.get('role', '')
-        
-        return 'administrators' in groups or role == 'admin'
-        
-    except Exception as e:
-        logger.error(f"Error checking admin role: {str(e)}")
-        return False
+    except Exception:
+        logger.exception("Create artist failed")
+        return create_error_response(500, "Internal server error", timestamp=now_iso)
 
 def validate_artist_input(input_data):
     """
@@ -88,27 +104,29 @@ def validate_artist_input(input_data):
     """
     errors = []
     
-    # Name validation
-    if not input_data.get('name') or not str(input_data['name']).strip():
+    # Each field is read and stripped once
+    name = input_data.get('name')
+    name = name.strip() if isinstance(name, str) else ''
+    if not name:
         errors.append('Artist name is required')
-    elif len(input_data['name'].strip()) < 2:
+    elif len(name) < 2:
         errors.append('Artist name must be at least 2 characters')
     
-    # Biography validation
-    if not input_data.get('biography') or not str(input_data['biography']).strip():
+    biography = input_data.get('biography')
+    biography = biography.strip() if isinstance(biography, str) else ''
+    if not biography:
         errors.append('Artist biography is required')
-    elif len(input_data['biography'].strip()) < 10:
+    elif len(biography) < 10:
         errors.append('Artist biography must be at least 10 characters')
     
     # Genres validation
-    if not input_data.get('genres'):
+    genres = input_data.get('genres')
+    if not genres:
         errors.append('At least one genre is required')
-    elif not isinstance(input_data['genres'], list):
+    elif not isinstance(genres, list):
         errors.append('Genres must be provided as a list')
-    elif len(input_data['genres']) == 0:
-        errors.append('At least one genre is required')
     else:
-        for genre in input_data['genres']:
+        for genre in genres:
             if not isinstance(genre, str):
                 errors.append(f'Invalid genre: {genre}.')
                 break
@@ -118,53 +136,7 @@ def validate_artist_input(input_data):
         'errors': errors
     }
 
-def check_artist_name_exists(name):
-    """Check if artist with the same name already exists"""
-    try:
-        table = dynamodb.Table(os.environ['ARTISTS_TABLE'])
-        response = table.query(
-            IndexName='name-index',
-            KeyConditionExpression='#name = :name',
-            ExpressionAttributeNames={'#name': 'name'},
-            ExpressionAttributeValues={':name': name.strip()}
-        )
-        return len(response['Items']) > 0
-    except Exception as e:
-        logger.error(f"Error checking artist name: {str(e)}")
-        return False
-
-def normalize_genre(genre):
-    """
-    DISCOVER OPTIMIZATION: Normalize genre names for consistent filtering
-    This ensures that "Rock", "rock", "ROCK" are all stored as "rock"
-    """
-    if not genre or not isinstance(genre, str):
-        return 'unknown'
-    
-    # Convert to lowercase and strip whitespace
-    normalized = genre.lower().strip()
-    
-    # Handle common variations and typos
-    genre_mappings = {
-        'r&b': 'rnb',
-        'rhythm and blues': 'rnb',
-        'hip-hop': 'hiphop',
-        'hip hop': 'hiphop',
-        'drum and bass': 'drumnbass',
-        'drum & bass': 'drumnbass',
-        'electronic dance music': 'edm',
-        'singer-songwriter': 'singersongwriter',
-        'alt-rock': 'alternative',
-        'alternative rock': 'alternative',
-        'heavy metal': 'metal',
-        'death metal': 'metal',
-        'black metal': 'metal',
-        'thrash metal': 'metal'
-    }
-    
-    return genre_mappings.get(normalized, normalized)
-
-def create_artist_record(artist_id, input_data, event):
+def create_artist_record(artist_id, input_data, event, now_iso):
     """
     Create artist record structure
     DISCOVER OPTIMIZATION: Sets primaryGenre for efficient querying
@@ -176,9 +148,8 @@ def create_artist_record(artist_id, input_data, event):
     creator_username = authorizer.get('username', 'unknown')
     
     # DISCOVER OPTIMIZATION: Normalize all genres for consistent filtering
-    normalized_genres = [normalize_genre(genre) for genre in input_data['genres']]
     # Remove duplicates while preserving order
-    normalized_genres = list(dict.fromkeys(normalized_genres))
+    normalized_genres = list(dict.fromkeys(map(normalize_genre, input_data['genres'])))
     # Remove 'unknown' if there are other valid genres
     if len(normalized_genres) > 1 and 'unknown' in normalized_genres:
         normalized_genres.remove('unknown')
@@ -194,8 +165,8 @@ def create_artist_record(artist_id, input_data, event):
         # DISCOVER OPTIMIZATION: Primary genre for efficient GSI queries
         'primaryGenre': primary_genre,
         'status': 'active',
-        'createdAt': datetime.utcnow().isoformat(),
-        'updatedAt': datetime.utcnow().isoformat(),
+        'createdAt': now_iso,
+        'updatedAt': now_iso,
         'createdBy': creator_username,
         'metadata': {
             'totalSongs': 0,
@@ -212,45 +183,103 @@ def create_artist_record(artist_id, input_data, event):
         'members': input_data.get('members', [])
     }
 
+def ensure_name_reservations():
+    """
+    Make sure the names of artists created before the ArtistNames table
+    existed are reserved, so the transaction in store_artist sees every name.
+    Checked once per container; the backfill itself runs once per deployment
+    """
+    if _NAME_RESERVATIONS['backfilled']:
+        return
+    if 'Item' not in artist_names_table.get_item(Key=ARTIST_NAMES_BACKFILL_MARKER):
+        backfill_artist_names()
+    _NAME_RESERVATIONS['backfilled'] = True
+
+def backfill_artist_names():
+    """Reserve the name of every stored artist, then write the backfill marker"""
+    scan_kwargs = {
+        'ProjectionExpression': '#name, artistId',
+        'ExpressionAttributeNames': {'#name': 'name'}
+    }
+    reserved = 0
+    # Names are not unique among the old artists - overwrite_by_pkeys keeps one per batch
+    with artist_names_table.batch_writer(overwrite_by_pkeys=['name']) as batch:
+        while True:
+            response = artists_table.scan(**scan_kwargs)
+            for item in response['Items']:
+                if item.get('name'):
+                    batch.put_item(Item={'name': item['name'], 'artistId': item['artistId']})
+                    reserved += 1
+            if 'LastEvaluatedKey' not in response:
+                break
+            scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    # Written last, so a failed backfill is simply retried by the next request
+    artist_names_table.put_item(Item=ARTIST_NAMES_BACKFILL_MARKER)
+    
+    logger.info("Artist names backfilled with %d reservations", reserved)
+
 def store_artist(artist_data):
-    """Store artist data in DynamoDB"""
+    """
+    Store artist data in DynamoDB
+    The artist item and its name reservation are written in one transaction,
+    so the uniqueness check needs no separate query and has no race window.
+    Returns False if the name is already taken.
+    """
     try:
-        table = dynamodb.Table(os.environ['ARTISTS_TABLE'])
-        table.put_item(Item=artist_data)
-        logger.info(f"Artist stored successfully: {artist_data['artistId']} with primary genre: {artist_data['primaryGenre']}")
+        dynamodb.meta.client.transact_write_items(
+            TransactItems=[
+                {
+                    'Put': {
+                        'TableName': artists_table.name,
+                        'Item': artist_data,
+                        'ConditionExpression': 'attribute_not_exists(artistId)'
+                    }
+                },
+                {
+                    'Put': {
+                        'TableName': artist_names_table.name,
+                        'Item': {
+                            'name': artist_data['name'],
+                            'artistId': artist_data['artistId']
+                        },
+                        'ConditionExpression': 'attribute_not_exists(#name)',
+                        'ExpressionAttributeNames': {'#name': 'name'}
+                    }
+                }
+            ]
+        )
+        logger.info("Artist stored successfully: %s with primary genre: %s", artist_data['artistId'], artist_data['primaryGenre'])
+        return True
         
-    except Exception as e:
-        logger.error(f"Error storing artist: {str(e)}")
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'TransactionCanceledException':
+            reasons = e.response.get('CancellationReasons', [])
+            if len(reasons) > 1 and reasons[1].get('Code') == 'ConditionalCheckFailed':
+                logger.info("Artist name already exists: %s", artist_data['name'])
+                return False
+        logger.error("Error storing artist: %s", e.response['Error']['Code'])
         raise
 
 def create_success_response(status_code, data):
     """Create standardized success response"""
     return {
         'statusCode': status_code,
-        'headers': get_cors_headers(),
-        'body': json.dumps(data, default=str)
+        'headers': _CORS_HEADERS,
+        'body': _json_encoder.encode(data)
     }
 
-def create_error_response(status_code, message, details=None):
+def create_error_response(status_code, message, details=None, timestamp=None):
     """Create standardized error response"""
     error_data = {
         'error': message,
-        'timestamp': datetime.utcnow().isoformat()
+        'timestamp': timestamp or datetime.now(timezone.utc).isoformat()
     }
     if details:
         error_data['details'] = details
     
     return {
         'statusCode': status_code,
-        'headers': get_cors_headers(),
-        'body': json.dumps(error_data)
+        'headers': _CORS_HEADERS,
+        'body': _json_encoder.encode(error_data)
     }
 
-def get_cors_headers():
-    """Get CORS headers for API responses"""
-    return {
-        'Access-Control-Allow-Origin': '*',
-        'Access-Control-Allow-Headers': 'Content-Type,Authorization,X-Requested-With',
-        'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
-        'Content-Type': 'application/json'
-    }
\ No newline at end of file
@@ -1,33 +1,107 @@
 import json
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 import os
-import uuid
 from datetime import datetime, timezone
-from typing import Any, Dict
-import base64
+import binascii
+import io
+import re
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache
+import logging
+from shared.utils import (
+    COVER_IMAGE_CACHE_CONTROL, COVER_IMAGE_URL_EXPIRY, emit_count_metric, get_file_extension,
+    normalize_genre, register_genres, uuid7
+)
 
-dynamodb = boto3.resource('dynamodb')
-s3_client = boto3.client('s3')
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+dynamodb = boto3.resource(
+    'dynamodb',
+    config=Config(tcp_keepalive=True, retries={'mode': 'standard', 'max_attempts': 2})
+)
+
+@lru_cache(maxsize=None)
+def _get_s3_client():
+    """
+    S3 client is created on first use, so requests rejected by the admin
+    or validation checks never load the (large) S3 service model.
+    Pinning SigV4 lets the client build its presigner once instead of
+    resolving the signature version on every generate_presigned_url call.
+    """
+    return boto3.client('s3', config=Config(
+        signature_version='s3v4',
+        tcp_keepalive=True,
+        # Room for the audio and cover uploads to each run max_concurrency parts at once
+        max_pool_connections=2 * S3_TRANSFER_CONFIG.max_request_concurrency + 2,
+        retries={'mode': 'standard', 'max_attempts': 3}
+    ))
+
+# Files above 8MB are sent as a multipart upload with parts in parallel
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=4,
+    use_threads=True
+)
+
+# Runs the audio and cover uploads side by side
+UPLOAD_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+
+music_content_table = dynamodb.Table(os.environ['MUSIC_CONTENT_TABLE'])
+genre_registry_table = dynamodb.Table(os.environ['GENRE_REGISTRY_TABLE'])
+BUCKET_NAME = os.environ['MUSIC_CONTENT_BUCKET']
+ALLOWED_FILE_TYPES = frozenset(os.environ['ALLOWED_FILE_TYPES'].split(','))
+ALLOWED_IMAGE_TYPES = frozenset(os.environ['ALLOWED_IMAGE_TYPES'].split(','))
+MAX_FILE_SIZE = int(os.environ['MAX_FILE_SIZE'])
+MAX_IMAGE_SIZE = int(os.environ.get('MAX_IMAGE_SIZE', '5242880')) # Default 5MB
+
+# Multipart part-header fields, matched directly on the raw header bytes
+_PART_NAME_RE = re.compile(rb'\bname="([^"]+)"')
+_PART_FILENAME_RE = re.compile(rb'\bfilename="([^"]+)"')
+_PART_CONTENT_TYPE_RE = re.compile(rb'^Content-Type:[ \t]*([^\r\n]*)', re.IGNORECASE | re.MULTILINE)
+
+_json_encoder = json.JSONEncoder(default=str, separators=(',', ':'))
+
+_CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization,X-Requested-With',
+    'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
+    'Content-Type': 'application/json'
+}
+
+if os.environ.get('AWS_LAMBDA_INITIALIZATION_TYPE') == 'provisioned-concurrency':
+    try:
+        dynamodb.meta.client.describe_table(TableName=music_content_table.name)
+        _get_s3_client().head_bucket(Bucket=BUCKET_NAME)
+    except Exception as e:
+        logger.warning("Warm-up failed: %s", e)
 
 def handler(event, context):
     try:
-        if not is_admin_user(event):
+        # Admin check - 'groups' is the comma-separated list set by the authorizer
+        authorizer = (event.get('requestContext') or {}).get('authorizer') or {}
+        if authorizer.get('role') != 'admin' and ',administrators,' not in f",{authorizer.get('groups') or ''},":
             return {
                 'statusCode': 403,
-                'headers': get_cors_headers(),
-                'body': json.dumps({'message': 'Access denied. Administrator role required.'})
+                'headers': _CORS_HEADERS,
+                'body': _json_encoder.encode({'message': 'Access denied. Administrator role required.'})
             }
         
-        table_name = os.environ['MUSIC_CONTENT_TABLE']
-        bucket_name = os.environ['MUSIC_CONTENT_BUCKET']
-        table = dynamodb.Table(table_name)
-
         headers = event.get('headers', {})
         body = event.get('body', '')
 
+        # Binary media types (multipart/form-data) always arrive base64-encoded.
+        # a2b_base64 reads the ASCII str in place - b64decode would first copy
+        # the whole body into an intermediate bytes object
         if event.get('isBase64Encoded', False):
-            body = base64.b64decode(body)
+            body = binascii.a2b_base64(body)
         else:
+            # A text body reaches Lambda already decoded from UTF-8, so encoding it
+            # back as UTF-8 restores the bytes API Gateway received. latin-1 would
+            # raise on any character above U+00FF, e.g. a non-Latin title in metadata
             body = body.encode('utf-8')
 
         boundary = None
@@ -38,8 +112,8 @@ def handler(event, context):
         else:
             return {
                 "statusCode": 400,
-                'headers': get_cors_headers(),
-                "body": json.dumps({"message": "Invalid content-type header"})
+                'headers': _CORS_HEADERS,
+                "body": _json_encoder.encode({"message": "Invalid content-type header"})
             }
         
         parts = _parse_multipart(body, boundary)
@@ -49,7 +123,7 @@ def handler(event, context):
 
         for part in parts:
             if part["name"] == "metadata":
-                metadata_part = json.loads(part["data"].decode('utf-8'))
+                metadata_part = json.loads(str(part["data"], 'utf-8'))
             elif part["name"] == "audioFile":
                 file_part = part
             elif part["name"] == "coverImage":
@@ -58,8 +132,8 @@ def handler(event, context):
         if not metadata_part or not file_part:
             return {
                 "statusCode": 400,
-                'headers': get_cors_headers(),
-                "body": json.dumps({"message": "Missing metadata or audioFile part"})
+                'headers': _CORS_HEADERS,
+                "body": _json_encoder.encode({"message": "Missing metadata or audioFile part"})
             }
         
         required_fields = ["title", "artistId"]
@@ -67,85 +141,64 @@ def handler(event, context):
             if field not in metadata_part:
                 return {
                     "statusCode": 400,
-                    'headers': get_cors_headers(),
-                    "body": json.dumps({"message": f"Missing required field: {field}"})
+                    'headers': _CORS_HEADERS,
+                    "body": _json_encoder.encode({"message": f"Missing required field: {field}"})
                 }
         
-        allowed_types = os.environ['ALLOWED_FILE_TYPES'].split(',')
         file_content_type = file_part.get("content_type", "audio/mpeg")
-        if file_content_type not in allowed_types:
+        if file_content_type not in ALLOWED_FILE_TYPES:
             return {
                 "statusCode": 400,
-                'headers': get_cors_headers(),
-                "body": json.dumps({"message": f"Unsupported audio file type: {file_content_type}"})
+                'headers': _CORS_HEADERS,
+                "body": _json_encoder.encode({"message": f"Unsupported audio file type: {file_content_type}"})
             }
         
-        max_size = int(os.environ['MAX_FILE_SIZE'])
         file_data = file_part["data"]
         file_size = len(file_data)
 
-        if file_size > max_size:
+        if file_size > MAX_FILE_SIZE:
             return {
                 "statusCode": 400,
-                'headers': get_cors_headers(),
-                "body": json.dumps({"message": f"File size exceeds the maximum limit of {max_size} bytes"})
+                'headers': _CORS_HEADERS,
+                "body": _json_encoder.encode({"message": f"File size exceeds the maximum limit of {MAX_FILE_SIZE} bytes"})
             }
         
-        content_id = str(uuid.uuid4())
-        file_key = f"music-content/{content_id}/{file_part['filename']}"
-
-        s3_client.put_object(
-            Bucket=bucket_name,
-            Key=file_key,
-            Body=file_data,
-            ContentType=file_content_type,
-            Metadata={
-                'contentId': content_id,
-                'originalFilename': file_part['filename'],
-                'uploadedAt': datetime.now(timezone.utc).isoformat()
-            }
-        )
-
-        allowed_image_types = os.environ['ALLOWED_IMAGE_TYPES'].split(',')
         cover_image_url = None
         cover_image_key = None
-        
+
+        # Validate the cover before anything is uploaded so a rejected
+        # request never leaves an orphaned audio file behind
         if cover_image_part:
             image_content_type = cover_image_part.get("content_type", "")
-            if image_content_type not in allowed_image_types:
+            if image_content_type not in ALLOWED_IMAGE_TYPES:
                 return {
                     "statusCode": 400,
-                    'headers': get_cors_headers(),
-                    "body": json.dumps({"message": f"Unsupported cover image file type: {image_content_type}"})
+                    'headers': _CORS_HEADERS,
+                    "body": _json_encoder.encode({"message": f"Unsupported cover image file type: {image_content_type}"})
                 }
 
-            max_image_size = int(os.environ.get('MAX_IMAGE_SIZE', '5242880')) # Default 5MB
             image_size = len(cover_image_part["data"])
-            if image_size > max_image_size:
+            if image_size > MAX_IMAGE_SIZE:
                 return {
                     "statusCode": 400,
-                    'headers': get_cors_headers(),
-                    "body": json.dumps({"message": f"Cover image size exceeds the maximum limit of {max_image_size} bytes"})
+                    'headers': _CORS_HEADERS,
+                    "body": _json_encoder.encode({"message": f"Cover image size exceeds the maximum limit of {MAX_IMAGE_SIZE} bytes"})
                 }
-            
-            image_extension = _get_file_extension(cover_image_part['filename'], image_content_type)
-            cover_image_key = f"music-content/{content_id}/cover{image_extension}"
 
-            s3_client.put_object(
-                Bucket=bucket_name,
-                Key=cover_image_key,
-                Body=cover_image_part["data"],
-                ContentType=image_content_type,
-                Metadata={
-                    'contentId': content_id,
-                    'originalFilename': cover_image_part['filename'],
-                    'uploadedAt': datetime.now(timezone.utc).isoformat()
-                }
-            )
+        # All checks passed - from here on the request talks to S3
+        s3_client = _get_s3_client()
+
+        content_id = uuid7()
+        file_key = f"music-content/{content_id}/{file_part['filename']}"
+
+        if cover_image_part:
+            image_extension = get_file_extension(cover_image_part['filename'], image_content_type)
+            cover_image_key = f"music-content/{content_id}/cover{image_extension}"
+            # Presigning is local request signing - no network call involved
             cover_image_url = s3_client.generate_presigned_url(
                 'get_object',
-                Params={'Bucket': bucket_name, 'Key': cover_image_key},
-                ExpiresIn=604800 # 1 week
+                Params={'Bucket': BUCKET_NAME, 'Key': cover_image_key},
+                ExpiresIn=COVER_IMAGE_URL_EXPIRY
             )
             
         current_time = datetime.now(timezone.utc).isoformat()
@@ -165,7 +218,7 @@ def handler(event, context):
             'fileType': file_content_type,
             'fileSize': file_size,
             's3Key': file_key,
-            'bucketName': bucket_name,
+            'bucketName': BUCKET_NAME,
             'createdAt': current_time,
             'lastModified': current_time,
             'genre': normalized_genre
@@ -186,34 +239,47 @@ def handler(event, context):
             if field in metadata_part and metadata_part[field]:
                 item[field] = metadata_part[field]
 
-        
+        # The audio and cover uploads are independent - run them concurrently
+        upload_futures = [
+            UPLOAD_EXECUTOR.submit(_upload_part, file_part, file_key, file_content_type, content_id, current_time)
+        ]
+        uploaded_keys = [file_key]
+        if cover_image_part:
+            upload_futures.append(
+                UPLOAD_EXECUTOR.submit(
+                    _upload_part, cover_image_part, cover_image_key, image_content_type, content_id, current_time,
+                    cache_control=COVER_IMAGE_CACHE_CONTROL
+                )
+            )
+            uploaded_keys.append(cover_image_key)
 
-        table.put_item(Item=item)
-        
-        response_data = {
-            "message": "Music content created successfully",
-            "contentId": content_id,
-            "title": item['title'],
-            "genre": item['genre'],
-            "filename": item['filename'],
-            "fileType": item['fileType'],
-            "fileSize": item['fileSize'],
-            "createdAt": item['createdAt']
-        }
+        wait(upload_futures)
 
-        if cover_image_part and cover_image_key:
-            response_data['coverImageUrl'] = cover_image_url
+        upload_errors = [f.exception() for f in upload_futures if f.exception()]
+        try:
+            if upload_errors:
+                raise upload_errors[0]
+            # The record is written only once its files exist, so readers never
+            # see an item whose audio is still missing
+            music_content_table.put_item(Item=item)
+        except Exception:
+            # Don't leave files behind that no record points to
+            _delete_uploaded_objects(uploaded_keys)
+            raise
+
+        register_genres(genre_registry_table, 'music', [normalized_genre])
         
         try:
-            #trigger_transcription(content_id, file_key, bucket_name)
+            #trigger_transcription(content_id, file_key, BUCKET_NAME)
             pass
         except Exception as e:
-            print(f"Warning: Could not trigger transcription: {str(e)}")
+            logger.warning("Could not trigger transcription: %s", e)
         
+        emit_count_metric('MusicContentCreated')
         return {
             "statusCode": 201,
-            'headers': get_cors_headers(),
-            "body": json.dumps({
+            'headers': _CORS_HEADERS,
+            "body": _json_encoder.encode({
                 "message": "Music content created successfully. Transcription started.",
                 "contentId": content_id,
                 "transcriptionStatus": "PROCESSING"
@@ -222,124 +288,127 @@ def handler(event, context):
     except json.JSONDecodeError:
         return {
             "statusCode": 400,
-            'headers': get_cors_headers(),
-            "body": json.dumps({"message": "Invalid JSON in metadata"})
+            'headers': _CORS_HEADERS,
+            "body": _json_encoder.encode({"message": "Invalid JSON in metadata"})
         }
-    except Exception as e:
-        print(f"Error: {str(e)}")
+    except Exception:
+        logger.exception("Create music content failed")
         return {
             "statusCode": 500,
-            'headers': get_cors_headers(),
-            "body": json.dumps({"message": "Internal server error"})
+            'headers': _CORS_HEADERS,
+            "body": _json_encoder.encode({"message": "Internal server error"})
         }
     
 
-def normalize_genre(genre):
+def _parse_multipart(body: bytes, boundary: str) -> list:
     """
-    DISCOVER OPTIMIZATION: Normalize genre names for consistent filtering
-    This ensures that "Rock", "rock", "ROCK" are all stored as "rock"
+    Parse a multipart/form-data body in a single forward scan.
+    Part data is returned as a memoryview into body, so parsing never
+    copies the (potentially multi-megabyte) file parts.
     """
-    if not genre or not isinstance(genre, str):
-        return 'unknown'
-    
-    # Convert to lowercase and strip whitespace
-    normalized = genre.lower().strip()
-    
-    # Handle common variations and typos
-    genre_mappings = {
-        'r&b': 'rnb',
-        'rhythm and blues': 'rnb',
-        'hip-hop': 'hiphop',
-        'hip hop': 'hiphop',
-        'drum and bass': 'drumnbass',
-        'drum & bass': 'drumnbass',
-        'electronic dance music': 'edm',
-        'singer-songwriter': 'singersongwriter',
-        'alt-rock': 'alternative',
-        'alternative rock': 'alternative',
-        'heavy metal': 'metal',
-        'death metal': 'metal',
-        'black metal': 'metal',
-        'thrash metal': 'metal'
-    }
-    
-    return genre_mappings.get(normalized, normalized)
+    parts = []
+    delimiter = f'--{boundary}'.encode('utf-8')
+    view = memoryview(body)
 
+    pos = body.find(delimiter)
+    while pos != -1:
+        start = pos + len(delimiter)
+        if body.startswith(b'--', start):
+            break # closing delimiter
 
+        next_pos = body.find(delimiter, start)
+        if next_pos == -1:
+            break
 
-def _parse_multipart(body: bytes, boundary: str) -> list:
-    parts = []
-    boundary_bytes = f'--{boundary}'.encode('utf-8')
-
-    sections = body.split(boundary_bytes)
-    for section in sections[1:-1]: #skip first and last boundary (empty)
-        if not section.strip():
-            continue
-
-        header_end = section.find(b'\r\n\r\n')
-        if header_end == -1:
-            continue
-
-        header_bytes = section[:header_end]
-        data = section[header_end + 4:]
-
-        if data.endswith(b'\r\n'):
-            data = data[:-2] # Remove trailing \r\n
-
-        headers = {}
-        name = None
-        filename = None
-        content_type = None
-
-        for header_line in header_bytes.decode('utf-8').split('\r\n'):
-            if header_line.startswith('Content-Disposition:'):
-                if 'name="' in header_line:
-                    name = header_line.split('name="')[1].split('"')[0]
-                if 'filename="' in header_line:
-                    filename = header_line.split('filename="')[1].split('"')[0]
-            elif header_line.startswith('Content-Type:'):
-                content_type = header_line.split('Content-Type:')[1].strip()
-
-        if name:
-            part = {
-                'name': name,
-                'data': data,
-                'headers': headers
-            }
-        if filename:
-            part['filename'] = filename
-        if content_type:
-            part['content_type'] = content_type
-        parts.append(part)
+        header_end = body.find(b'\r\n\r\n', start, next_pos)
+        if header_end != -1:
+            header_bytes = view[start:header_end]
+            data_start = header_end + 4
+            data_end = next_pos - 2 if body.endswith(b'\r\n', data_start, next_pos) else next_pos
+
+            name = _PART_NAME_RE.search(header_bytes)
+            if name:
+                part = {
+                    'name': name.group(1).decode('utf-8'),
+                    'data': view[data_start:data_end],
+                    'headers': {}
+                }
+                filename = _PART_FILENAME_RE.search(header_bytes)
+                if filename:
+                    part['filename'] = filename.group(1).decode('utf-8')
+                content_type = _PART_CONTENT_TYPE_RE.search(header_bytes)
+                if content_type and content_type.group(1).strip():
+                    part['content_type'] = content_type.group(1).strip().decode('utf-8')
+                parts.append(part)
+
+        pos = next_pos
 
     return parts
 
-def is_admin_user(event):
-    """Check if the user has administrator role"""
+class _MemoryViewReader(io.RawIOBase):
+    """
+    Read-only, seekable file object over a memoryview. io.BytesIO copies a
+    memoryview on construction; this lets upload_fileobj stream the part
+    straight out of the request body instead.
+    """
+
+    def __init__(self, view):
+        self._view = view
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        count = max(0, min(len(buffer), len(self._view) - self._pos))
+        buffer[:count] = self._view[self._pos:self._pos + count]
+        self._pos += count
+        return count
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._pos = offset
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+def _upload_part(part, key, content_type, content_id, uploaded_at, cache_control=None):
+    extra_args = {
+        'ContentType': content_type,
+        'Metadata': {
+            'contentId': content_id,
+            'originalFilename': part['filename'],
+            'uploadedAt': uploaded_at
+        }
+    }
+    if cache_control:
+        extra_args['CacheControl'] = cache_control
+
+    _get_s3_client().upload_fileobj(
+        _MemoryViewReader(part["data"]),
+        BUCKET_NAME,
+        key,
+        ExtraArgs=extra_args,
+        Config=S3_TRANSFER_CONFIG
+    )
+
+def _delete_uploaded_objects(keys):
+    """Best-effort removal of objects stored for a request that failed"""
     try:
-        request_context = event.get('requestContext', {})
-        authorizer = request_context.get('authorizer', {})
-        
-        # Check if user is in administrators group
-        groups = authorizer.get('groups', '').split(',')
-        role = authorizer.get('role', '')
-        
-        return 'administrators' in groups or role == 'admin'
-        
-    except Exception as e:
-        print(f"Error checking admin role: {str(e)}")
-        return False
-    
-def _get_file_extension(filename, content_type):
-    if content_type == 'image/jpeg':
-        return '.jpg'
-    elif content_type == 'image/png':
-        return '.png'
-    elif content_type == 'image/webp':
-        return '.webp'
-    else:
-        return '.' + filename.split('.')[-1] if '.' in filename else '.jpg'
-    
+        _get_s3_client().delete_objects(
+            Bucket=BUCKET_NAME,
+            Delete={'Objects': [{'Key': key} for key in keys], 'Quiet': True}
+        )
+    except Exception:
+        logger.exception("Could not delete uploaded objects %s", keys)
+
 def trigger_transcription(content_id, s3_key, bucket_name):
     """Trigger transcription processing for uploaded music content"""
     
@@ -358,13 +427,5 @@ def trigger_transcription(content_id, s3_key, bucket_name):
         Payload=json.dumps(payload)
     )
     
-    print(f"Transcription triggered for content: {content_id}")
-    
-def get_cors_headers():
-    """Get CORS headers for API responses"""
-    return {
-        'Access-Control-Allow-Origin': '*',
-        'Access-Control-Allow-Headers': 'Content-Type,Authorization,X-Requested-With',
-        'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
-        'Content-Type': 'application/json'
-    }
\ No newline at end of file
+    logger.info("Transcription triggered for content: %s", content_id)
+
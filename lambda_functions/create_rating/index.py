@@ -1,14 +1,35 @@
 import json
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
 import uuid
 import os
 from datetime import datetime
 import logging
+from shared.utils import emit_count_metric
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-dynamodb = boto3.resource('dynamodb')
+# Low-level client: the rating item has a fixed shape, so it is marshalled
+# by hand instead of going through the resource layer's TypeSerializer
+dynamodb_client = boto3.client(
+    'dynamodb',
+    config=Config(tcp_keepalive=True, retries={'mode': 'standard', 'max_attempts': 2})
+)
+lambda_client = boto3.client('lambda')
+
+RATINGS_TABLE = os.environ['RATINGS_TABLE']
+CALCULATE_FEED_FUNCTION = os.environ['CALCULATE_FEED_FUNCTION']
+
+_json_encoder = json.JSONEncoder(default=str, separators=(',', ':'))
+
+_CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization,X-Requested-With',
+    'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
+    'Content-Type': 'application/json'
+}
 
 def handler(event, context):
     """
@@ -16,39 +37,46 @@ def handler(event, context):
     Implements requirement 1.3: Kreiranje ocene 
     """
     
-    logger.info("Create artist request received")
-    
+    # One timestamp for the whole request - record, feed trigger and responses share it.
+    # Naive UTC, the format already stored in existing items
+    now_iso = datetime.utcnow().isoformat()
+
     try:
         
         # Parse request body
         if not event.get('body'):
-            return create_error_response(400, "Request body is required")
+            return create_error_response(400, "Request body is required", timestamp=now_iso)
         
         body = json.loads(event['body'])
         
+        # Validate before any DynamoDB call - a bad rating must not reach the write
+        try:
+            stars = int(body['stars'])
+        except (KeyError, TypeError, ValueError):
+            stars = 0
+        if stars < 1 or stars > 5:
+            return create_error_response(400, 'Incorrect input for rating (1-5)!', timestamp=now_iso)
+        
         # Create artist
         rating_id = str(uuid.uuid4())
-        rating_data = create_rating_record(rating_id, body, event)
-        
-        if int(rating_data['stars']) < 1 or int(rating_data['stars']) > 5:
-            create_error_response(400, 'Incorrect input for rating (1-5)!')
+        username = ((event.get('requestContext') or {}).get('authorizer') or {}).get('username', {})
+        rating_data = create_rating_record(rating_id, body, username, now_iso)
 
-        request_context = event.get('requestContext', {})
-        authorizer = request_context.get('authorizer', {})
-        username = authorizer.get('username', {})
-
-        # Store in DynamoDB
-        store_rating(rating_data)
+        # Store in DynamoDB - fails if this user already rated the song
+        if not store_rating(rating_data):
+            return create_error_response(400, 'You have already rated this item!', timestamp=now_iso)
         
-        logger.info(f"Rating created successfully: {rating_id}")
+        logger.info("Rating created successfully: %s", rating_id)
 
         
 
         trigger_feed_calculation(
             username=username,
-            rating=rating_data
+            rating=rating_data,
+            timestamp=now_iso
         )
 
+        emit_count_metric('RatingCreated')
         return create_success_response(201, {
             'message': 'Rating created successfully',
             'artist': {
@@ -58,72 +86,51 @@ def handler(event, context):
             }
         })
         
-    except Exception as e:
-        logger.error(f"Create rating error: {str(e)}")
-        return create_error_response(500, "Internal server error")
+    except Exception:
+        logger.exception("Create rating failed")
+        return create_error_response(500, "Internal server error", timestamp=now_iso)
 
-def create_rating_record(rating_id, input_data, event):
+def create_rating_record(rating_id, input_data, username, now_iso):
     """Create rating record structure"""
-    
-    # Get creator info from authorizer context
-    request_context = event.get('requestContext', {})
-    authorizer = request_context.get('authorizer', {})
-    username = authorizer.get('username', {})
-    
     return {
         'ratingId': input_data['songId'] + '#' + username,
         'username': username,
         'songId': input_data['songId'],
         'stars': input_data['stars'],
-        'timestamp': datetime.now().isoformat()
+        'timestamp': now_iso
     }
 
 
-def has_rated(song_id, username):
+def store_rating(rating_data):
     """
-    Check if a given user has already rated a given song.
-    Returns True if exists, False otherwise.
-    Uses direct GetItem instead of expensive Scan operation.
+    Store rating data in DynamoDB
+    ratingId is songId#username, so a conditional put rejects a second
+    rating from the same user without a separate existence check.
+    Returns False if the user has already rated this song.
     """
+    stars = rating_data['stars']
+    item = {
+        'ratingId': {'S': rating_data['ratingId']},
+        'username': {'S': rating_data['username']},
+        'songId': {'S': rating_data['songId']},
+        # Stored with the type the client sent, as the resource API would
+        'stars': {'S': stars} if isinstance(stars, str) else {'N': str(stars)},
+        'timestamp': {'S': rating_data['timestamp']}
+    }
     try:
-        table = dynamodb.Table(os.environ['RATINGS_TABLE'])
-        
-        # Direct lookup using composite partition key
-        rating_id = f"{song_id}#{username}"
-        
-        response = table.get_item(
-            Key={'ratingId': rating_id}
+        dynamodb_client.put_item(
+            TableName=RATINGS_TABLE,
+            Item=item,
+            ConditionExpression='attribute_not_exists(ratingId)'
         )
+        logger.info("Rating stored successfully: %s", rating_data['songId'])
+        return True
         
-        # Check if item exists
-        return 'Item' in response
-        
-    except Exception as e:
-        logger.error(f"Error checking rating existence: {str(e)}")
-        raise
-
-def store_rating(rating_data):
-    """Store rating with duplicate check using scan (for small tables)"""
-    try:
-        table = dynamodb.Table(os.environ['RATINGS_TABLE'])
-
-        if has_rated(rating_data['songId'], rating_data['username']):
-            logger.warning(f"Duplicate rating found")
-            raise ValueError('You have already rated this item!')
-        
-        # Store rating ako nema duplikata
-        table.put_item(Item=rating_data)
-        logger.info(f"Rating stored successfully: {rating_data['songId']}")
-        
-    except Exception as e:
-        logger.error(f"DynamoDB error: {str(e)}")
-        raise
-    except ValueError as e:
-        # Re-raise custom validation error
-        return create_error_response(400, str(e), 'You have already rated this item!')
-          
-    except Exception as e:
-        logger.error(f"Error storing rating: {str(e)}")
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            logger.warning("Duplicate rating found")
+            return False
+        logger.error("Error storing rating: %s", e.response['Error']['Code'])
         raise
 
 
@@ -142,51 +149,41 @@ def create_success_response(status_code, data):
     """Create standardized success response"""
     return {
         'statusCode': status_code,
-        'headers': get_cors_headers(),
-        'body': json.dumps(data, default=str)
+        'headers': _CORS_HEADERS,
+        'body': _json_encoder.encode(data)
     }
 
-def create_error_response(status_code, message, details=None):
+def create_error_response(status_code, message, details=None, timestamp=None):
     """Create standardized error response"""
     error_data = {
         'error': message,
-        'timestamp': datetime.utcnow().isoformat()
+        'timestamp': timestamp or datetime.utcnow().isoformat()
     }
     if details:
         error_data['details'] = details
     
     return {
         'statusCode': status_code,
-        'headers': get_cors_headers(),
-        'body': json.dumps(error_data)
+        'headers': _CORS_HEADERS,
+        'body': _json_encoder.encode(error_data)
     }
 
-def trigger_feed_calculation(username, rating=None):
+def trigger_feed_calculation(username, rating=None, timestamp=None):
     """Trigger feed calculation after rating update"""
     
-    lambda_client = boto3.client('lambda')
-    
     payload = {
         'username': username,
         'action': 'rating_updated',
         'rating': rating,
-        'timestamp': datetime.now().isoformat()
+        'timestamp': timestamp or datetime.utcnow().isoformat()
     }
     
     # Invoke calculate feed function asynchronously
     lambda_client.invoke(
-        FunctionName=os.environ['CALCULATE_FEED_FUNCTION'],
+        FunctionName=CALCULATE_FEED_FUNCTION,
         InvocationType='Event',  # Async invocation
-        Payload=json.dumps(payload)
+        Payload=_json_encoder.encode(payload)
     )
     
-    print(f"Feed calculation triggered for user: {username}")
+    logger.info("Feed calculation triggered for user: %s", username)
 
-def get_cors_headers():
-    """Get CORS headers for API responses"""
-    return {
-        'Access-Control-Allow-Origin': '*',
-        'Access-Control-Allow-Headers': 'Content-Type,Authorization,X-Requested-With',
-        'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
-        'Content-Type': 'application/json'
-    }
\ No newline at end of file
@@ -1,16 +1,42 @@
 import json
-from xml.dom.minidom import Attr
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
 import uuid
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
-from boto3.dynamodb.conditions import Key
+from shared.utils import emit_count_metric
+from boto3.dynamodb.conditions import Key, Attr
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-dynamodb = boto3.resource('dynamodb')
+_dynamodb_config = Config(tcp_keepalive=True, max_pool_connections=2, retries={'mode': 'standard', 'max_attempts': 2})
+dynamodb = boto3.resource('dynamodb', config=_dynamodb_config)
+# Low-level client for the fixed-shape subscription put - skips the resource
+# layer's TypeSerializer; the resource is still used for the GSI query.
+# Not dynamodb.meta.client: that client still runs the TypeSerializer, which
+# would wrap the hand-marshalled AttributeValues a second time
+dynamodb_client = boto3.client('dynamodb', config=_dynamodb_config)
+lambda_client = boto3.client('lambda')
+
+subscriptions_table = dynamodb.Table(os.environ['SUBSCRIPTIONS_TABLE'])
+CALCULATE_FEED_FUNCTION = os.environ['CALCULATE_FEED_FUNCTION']
+
+_json_encoder = json.JSONEncoder(default=str, separators=(',', ':'))
+
+_CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization,X-Requested-With',
+    'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
+    'Content-Type': 'application/json'
+}
+
+# Upper bound on one bulk request
+MAX_BATCH_SUBSCRIPTIONS = 100
+# Comfortably above a full bulk request; anything larger is rejected unparsed
+MAX_BODY_LENGTH = 65536
 
 def handler(event, context):
     """
@@ -18,30 +44,52 @@ def handler(event, context):
     Implements requirement 1.3: Kreiranje pretplate 
     """
     
-    logger.info("Create subscription request received")
-    
+    # One timestamp for the whole request - record, feed trigger and responses share it
+    now_iso = _utcnow_iso()
+
     try:
         
         # Parse request body
-        if not event.get('body'):
-            return create_error_response(400, "Request body is required")
+        raw_body = event.get('body')
+        if not raw_body:
+            return create_error_response(400, "Request body is required", timestamp=now_iso)
+        
+        # Oversized bodies never reach the parser
+        if len(raw_body) > MAX_BODY_LENGTH:
+            return create_error_response(413, "Request body too large", timestamp=now_iso)
         
-        body = json.loads(event['body'])
+        body = json.loads(raw_body)
+        if not isinstance(body, dict):
+            return create_error_response(400, "Request body must be a JSON object", timestamp=now_iso)
+        
+        # Subscriber comes from the authorizer context - read it once for every record
+        username = ((event.get('requestContext') or {}).get('authorizer') or {}).get('username', {})
+        
+        # Bulk mode - {"subscriptions": [...]} subscribes to many targets at once
+        if isinstance(body.get('subscriptions'), list):
+            return create_subscriptions_batch(body['subscriptions'], username, now_iso)
+        
+        errors = validate_subscription_input(body)
+        if errors:
+            return create_error_response(400, "Validation failed", errors, timestamp=now_iso)
         
         # Create artist
-        subscription_id = str(uuid.uuid4())
-        subscription_data = create_subscription_record(subscription_id, body, event)
+        subscription_id = uuid.uuid4().hex
+        subscription_data = create_subscription_record(subscription_id, body, username, now_iso)
         
-        # Store in DynamoDB
-        store_subscription(subscription_data)
+        # Store in DynamoDB - fails if already subscribed to the same target
+        if not store_subscription(subscription_data):
+            return create_error_response(400, 'You are already subscribed to selected content!', timestamp=now_iso)
         
-        logger.info(f"Subscription created successfully: {subscription_id}")
+        logger.info("Subscription created successfully: %s", subscription_id)
         
         trigger_feed_calculation(
             username=subscription_data['username'],
-            subscription=subscription_data
+            subscription=subscription_data,
+            timestamp=now_iso
         )
 
+        emit_count_metric('SubscriptionCreated')
         return create_success_response(201, {
             'message': 'Subscription created successfully',
             'subscription': {
@@ -54,79 +102,180 @@ def handler(event, context):
             }
         })
         
-    except Exception as e:
-        logger.error(f"Create Subscription error: {str(e)}")
-        return create_error_response(500, "Internal server error")
+    except json.JSONDecodeError:
+        return create_error_response(400, "Invalid JSON in request body", timestamp=now_iso)
+    except Exception:
+        logger.exception("Create subscription failed")
+        return create_error_response(500, "Internal server error", timestamp=now_iso)
 
-def create_subscription_record(subscription_id, input_data, event):
+def create_subscription_record(subscription_id, input_data, username, now_iso):
     """Create subscription record structure"""
-    
-    # Get creator info from authorizer context
-    request_context = event.get('requestContext', {})
-    authorizer = request_context.get('authorizer', {})
-    subscriber = authorizer.get('username', {})
-    
     return {
         'subscriptionId': subscription_id,
-        'username': subscriber,
+        'username': username,
         'subscriptionType': input_data['subscriptionType'],
-        'targetId': input_data['targetId'],
+        'targetId': input_data.get('targetId'),
         'targetName': input_data['targetName'],
-        'timestamp': datetime.now().isoformat()
+        'timestamp': now_iso
     }
 
+def validate_subscription_input(input_data):
+    """
+    Validate one subscription - returns the list of problems, empty if valid.
+    Every stored attribute is a string; genre subscriptions may omit targetId
+    """
+    if not isinstance(input_data, dict):
+        return ['Subscription must be a JSON object']
+    
+    errors = []
+    sub_type = input_data.get('subscriptionType')
+    if not isinstance(sub_type, str) or not sub_type:
+        errors.append('subscriptionType is required')
+    
+    target_name = input_data.get('targetName')
+    if not isinstance(target_name, str) or not target_name:
+        errors.append('targetName is required')
+    
+    target_id = input_data.get('targetId')
+    if target_id is not None and not isinstance(target_id, str):
+        errors.append('targetId must be a string')
+    elif isinstance(sub_type, str) and sub_type.upper() == 'ARTIST' and not target_id:
+        errors.append('targetId is required for artist subscriptions')
+    
+    return errors
 
 def store_subscription(subscription_data):
-    """Store subscription with duplicate check using scan (za male tabele)"""
+    """
+    Store subscription with duplicate check
+    Returns False if the user is already subscribed to the target.
+    """
     try:
-        table = dynamodb.Table(os.environ['SUBSCRIPTIONS_TABLE'])
-        
-        username = subscription_data['username']
-        sub_type = subscription_data.get('subscriptionType', 'ARTIST').upper()
-        target_name = subscription_data['targetName']
-
-        # Ako je ARTIST, tražimo duplikat po username + subscriptionType + artistId
-        if sub_type == 'ARTIST':
-            targetId = subscription_data['targetId']
-            response = table.scan(
-                FilterExpression='username = :username AND #subscriptionType = :stype AND targetId = :targetId',
-                ExpressionAttributeNames={'#subscriptionType': 'subscriptionType'},
-                ExpressionAttributeValues={
-                    ':username': username,
-                    ':stype': sub_type,
-                    ':targetId': targetId
-                }
-            )
-        else:  # GENRE
-            response = table.scan(
-                FilterExpression='username = :username AND #subscriptionType = :stype AND targetName = :targetName',
-                ExpressionAttributeNames={'#subscriptionType': 'subscriptionType'},
-                ExpressionAttributeValues={
-                    ':username': username,
-                    ':stype': sub_type,
-                    ':targetName': target_name
-                }
-            )
-        
-        # Ako postoji duplikat → greška
-        if response['Items']:
-            existing_sub = response['Items'][0]
-            logger.warning(f"Duplicate subscription found: {existing_sub['subscriptionId']}")
-            raise ValueError('You are already subscribed to selected content!')
+        if is_already_subscribed(subscription_data):
+            return False
         
         # Ako nema → upisujemo novi subscription
-        table.put_item(Item=subscription_data)
-        logger.info(f"Subscription stored successfully: {subscription_data['subscriptionId']}")
-    except Exception as e:
-        logger.error(f"DynamoDB error: {str(e)}")
-        raise
-    except ValueError as e:
-        # Re-raise custom validation error
-        return create_error_response(400, str(e), 'You are already subscribed to selected content!')  
-    except Exception as e:
-        logger.error(f"Error storing subscription: {str(e)}")
+        dynamodb_client.put_item(
+            TableName=subscriptions_table.name,
+            Item={name: _string_attribute(value) for name, value in subscription_data.items()}
+        )
+        return True
+    except ClientError as e:
+        logger.error("Error storing subscription: %s", e.response['Error']['Code'])
         raise
 
+def is_already_subscribed(subscription_data):
+    """
+    Queries only this user's subscriptions of the same type through the
+    username-subscriptionType-index GSI instead of scanning the table.
+    """
+    sub_type, target_attr, target_value = _subscription_target(subscription_data)
+    query_kwargs = {
+        'IndexName': 'username-subscriptionType-index',
+        'KeyConditionExpression': Key('username').eq(subscription_data['username']) & Key('subscriptionType').eq(sub_type),
+        'FilterExpression': Attr(target_attr).eq(target_value)
+    }
+    while True:
+        response = subscriptions_table.query(**query_kwargs)
+        # Ako postoji duplikat → ne upisujemo
+        if response['Items']:
+            existing_sub = response['Items'][0]
+            logger.warning("Duplicate subscription found: %s", existing_sub['subscriptionId'])
+            return True
+        if 'LastEvaluatedKey' not in response:
+            return False
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def _subscription_target(subscription_data):
+    """(subscriptionType, attribute, value) that identifies what is subscribed to"""
+    sub_type = subscription_data.get('subscriptionType', 'ARTIST').upper()
+    # Ako je ARTIST, tražimo duplikat po artistId, inače po targetName (GENRE)
+    if sub_type == 'ARTIST':
+        return sub_type, 'targetId', subscription_data['targetId']
+    return sub_type, 'targetName', subscription_data['targetName']
+
+def _subscribed_targets(username, sub_type, target_attr):
+    """Target values of all the user's subscriptions of one type - a single paginated GSI query"""
+    query_kwargs = {
+        'IndexName': 'username-subscriptionType-index',
+        'KeyConditionExpression': Key('username').eq(username) & Key('subscriptionType').eq(sub_type),
+        'ProjectionExpression': '#target',
+        'ExpressionAttributeNames': {'#target': target_attr}
+    }
+    targets = set()
+    while True:
+        response = subscriptions_table.query(**query_kwargs)
+        targets.update(item.get(target_attr) for item in response['Items'])
+        if 'LastEvaluatedKey' not in response:
+            return targets
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def create_subscriptions_batch(inputs, username, now_iso):
+    """
+    Bulk mode: new subscriptions are written through batch_writer, which sends
+    BatchWriteItem requests of up to 25 items and resends unprocessed ones.
+    Targets the user is already subscribed to, or that repeat within the
+    request, are skipped. Existing subscriptions are read with one query per
+    subscription type rather than one per item.
+    """
+    if not inputs or len(inputs) > MAX_BATCH_SUBSCRIPTIONS:
+        return create_error_response(
+            400, f"subscriptions must contain between 1 and {MAX_BATCH_SUBSCRIPTIONS} items", timestamp=now_iso
+        )
+    
+    errors = [
+        f'subscriptions[{index}]: {error}'
+        for index, input_data in enumerate(inputs)
+        for error in validate_subscription_input(input_data)
+    ]
+    if errors:
+        return create_error_response(400, "Validation failed", errors, timestamp=now_iso)
+    
+    records = []
+    # subscriptionType -> targets already subscribed to; the target attribute is fixed per type
+    subscribed = {}
+    for input_data in inputs:
+        record = create_subscription_record(uuid.uuid4().hex, input_data, username, now_iso)
+        sub_type, target_attr, target_value = _subscription_target(record)
+        if sub_type not in subscribed:
+            subscribed[sub_type] = _subscribed_targets(username, sub_type, target_attr)
+        if target_value in subscribed[sub_type]:
+            continue
+        subscribed[sub_type].add(target_value)
+        records.append(record)
+    
+    if not records:
+        return create_error_response(400, 'You are already subscribed to selected content!', timestamp=now_iso)
+    
+    with subscriptions_table.batch_writer() as batch:
+        for record in records:
+            batch.put_item(Item=record)
+    
+    logger.info("Subscriptions created successfully: %d", len(records))
+    
+    trigger_feed_calculation(
+        username=username,
+        timestamp=now_iso
+    )
+    
+    emit_count_metric('SubscriptionCreated', len(records))
+    return create_success_response(201, {
+        'message': 'Subscriptions created successfully',
+        'subscriptions': [
+            {
+                'subscriptionId': record['subscriptionId'],
+                'subscriptionType': record['subscriptionType'],
+                'targetId': record['targetId'],
+                'targetName': record['targetName']
+            }
+            for record in records
+        ],
+        'skipped': len(inputs) - len(records)
+    })
+
+def _string_attribute(value):
+    """Every subscription attribute is a string; a missing targetId is stored as NULL"""
+    return {'NULL': True} if value is None else {'S': value}
+
 # def store_subscription(subscription_data):
 #     """Store subscription with duplicate check using scan (za male tabele)"""
 #     try:
@@ -182,51 +331,44 @@ def create_success_response(status_code, data):
     """Create standardized success response"""
     return {
         'statusCode': status_code,
-        'headers': get_cors_headers(),
-        'body': json.dumps(data, default=str)
+        'headers': _CORS_HEADERS,
+        'body': _json_encoder.encode(data)
     }
 
-def trigger_feed_calculation(username, subscription=None):
+def trigger_feed_calculation(username, subscription=None, timestamp=None):
     """Trigger feed calculation after subscription update"""
     
-    lambda_client = boto3.client('lambda')
-    
     payload = {
         'username': username,
         'action': 'subscription_updated',
         'subscription': subscription,
-        'timestamp': datetime.now().isoformat()
+        'timestamp': timestamp or _utcnow_iso()
     }
     
     # Invoke calculate feed function asynchronously
     lambda_client.invoke(
-        FunctionName=os.environ['CALCULATE_FEED_FUNCTION'],
+        FunctionName=CALCULATE_FEED_FUNCTION,
         InvocationType='Event',  # Async invocation
-        Payload=json.dumps(payload)
+        Payload=_json_encoder.encode(payload)
     )
     
-    print(f"Feed calculation triggered for user: {username}")
+    logger.info("Feed calculation triggered for user: %s", username)
 
-def create_error_response(status_code, message, details=None):
+def create_error_response(status_code, message, details=None, timestamp=None):
     """Create standardized error response"""
     error_data = {
         'error': message,
-        'timestamp': datetime.utcnow().isoformat()
+        'timestamp': timestamp or _utcnow_iso()
     }
     if details:
         error_data['details'] = details
     
     return {
         'statusCode': status_code,
-        'headers': get_cors_headers(),
-        'body': json.dumps(error_data)
+        'headers': _CORS_HEADERS,
+        'body': _json_encoder.encode(error_data)
     }
 
-def get_cors_headers():
-    """Get CORS headers for API responses"""
-    return {
-        'Access-Control-Allow-Origin': '*',
-        'Access-Control-Allow-Headers': 'Content-Type,Authorization,X-Requested-With',
-        'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
-        'Content-Type': 'application/json'
-    }
\ No newline at end of file
+def _utcnow_iso():
+    """Current time as a timezone-aware UTC ISO 8601 string"""
+    return datetime.now(timezone.utc).isoformat()
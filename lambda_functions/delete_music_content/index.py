@@ -1,124 +1,169 @@
 import json
 import boto3
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
 import os
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache
+import logging
+from shared.utils import bump_genre_registry_version
 
-dynamodb = boto3.resource('dynamodb')
-s3 = boto3.client('s3')
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Clients are created on first use, so requests rejected by the admin or
+# input checks never load the DynamoDB and S3 service models
+@lru_cache(maxsize=None)
+def _get_dynamodb():
+    return boto3.resource(
+        'dynamodb',
+        config=Config(tcp_keepalive=True, max_pool_connections=2, retries={'mode': 'standard', 'max_attempts': 2})
+    )
+
+@lru_cache(maxsize=None)
+def _get_music_content_table():
+    return _get_dynamodb().Table(MUSIC_CONTENT_TABLE)
+
+@lru_cache(maxsize=None)
+def _get_genre_registry_table():
+    return _get_dynamodb().Table(GENRE_REGISTRY_TABLE)
+
+@lru_cache(maxsize=None)
+def _get_s3_client():
+    return boto3.client(
+        's3',
+        # One connection per cleanup worker
+        config=Config(tcp_keepalive=True, max_pool_connections=2, retries={'mode': 'standard', 'max_attempts': 3})
+    )
+
+# Runs the S3 cleanup and the genre version bump side by side
+CLEANUP_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+
+MUSIC_CONTENT_TABLE = os.environ['MUSIC_CONTENT_TABLE']
+GENRE_REGISTRY_TABLE = os.environ['GENRE_REGISTRY_TABLE']
+BUCKET_NAME = os.environ['MUSIC_CONTENT_BUCKET']
+# A delete body only carries a contentId - anything larger is rejected unparsed
+MAX_BODY_LENGTH = 4096
+
+_json_encoder = json.JSONEncoder(default=str, separators=(',', ':'))
+
+# Fixed-message response bodies - encoded once instead of on every rejection
+_ACCESS_DENIED_BODY = _json_encoder.encode({'message': 'Access denied. Administrator role required.'})
+_INVALID_JSON_BODY = _json_encoder.encode({'message': 'Invalid JSON in request body'})
+_BODY_TOO_LARGE_BODY = _json_encoder.encode({'message': 'Request body too large'})
+_MISSING_CONTENT_ID_BODY = _json_encoder.encode({'message': 'contentId is required in query parameters or body'})
+_NOT_FOUND_BODY = _json_encoder.encode({'message': 'Content not found'})
+
+_CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization,X-Requested-With',
+    'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
+    'Content-Type': 'application/json'
+}
 
 def handler(event, context):
     try:
-        if not is_admin_user(event):
+        # Admin check - 'groups' is the comma-separated list set by the authorizer
+        authorizer = (event.get('requestContext') or {}).get('authorizer') or {}
+        if authorizer.get('role') != 'admin' and ',administrators,' not in f",{authorizer.get('groups') or ''},":
             return {
                 'statusCode': 403,
-                'headers': get_cors_headers(),
-                'body': json.dumps({'message': 'Access denied. Administrator role required.'})
+                'headers': _CORS_HEADERS,
+                'body': _ACCESS_DENIED_BODY
             }
 
-        table_name = os.environ['MUSIC_CONTENT_TABLE']
-        bucket_name = os.environ['MUSIC_CONTENT_BUCKET']
-        table = dynamodb.Table(table_name)
-
         content_id = None
         if event.get('queryStringParameters') and event['queryStringParameters']:
             content_id = event['queryStringParameters'].get('contentId')
 
-        if not content_id and event.get('body'):
+        raw_body = event.get('body')
+        if not content_id and raw_body:
+            if len(raw_body) > MAX_BODY_LENGTH:
+                return {
+                    'statusCode': 413,
+                    'headers': _CORS_HEADERS,
+                    'body': _BODY_TOO_LARGE_BODY
+                }
             try:
-                body = json.loads(event['body'])
-                content_id = body.get('contentId')
+                body = json.loads(raw_body)
             except json.JSONDecodeError:
+                body = None
+            # Malformed and non-object bodies are rejected alike
+            if not isinstance(body, dict):
                 return {
                     'statusCode': 400,
-                    'headers': get_cors_headers(),
-                    'body': json.dumps({'message': 'Invalid JSON in request body'})
+                    'headers': _CORS_HEADERS,
+                    'body': _INVALID_JSON_BODY
                 }
+            content_id = body.get('contentId')
         if not content_id:
             return {
                 'statusCode': 400,
-                'headers': get_cors_headers(),
-                'body': json.dumps({'message': 'contentId is required in query parameters or body'})
+                'headers': _CORS_HEADERS,
+                'body': _MISSING_CONTENT_ID_BODY
             }
         
+        # One round-trip: delete the item and get back the keys needed for the S3 cleanup
         try:
-            response = table.get_item(Key={'contentId': content_id})
-            if 'Item' not in response:
-                return {
-                    'statusCode': 404,
-                    'headers': get_cors_headers(),
-                    'body': json.dumps({'message': 'Content not found'})
-                }
-            item = response['Item']
-            s3_key = item.get('s3Key')
-            image_s3_key = item.get('imageS3Key')
-            title = item.get('title', 'Unknown')
-        except Exception as e:
+            response = _get_music_content_table().delete_item(
+                Key={'contentId': content_id},
+                ReturnValues='ALL_OLD'
+            )
+        except ClientError as e:
+            logger.error("Error deleting item from DynamoDB: %s", e)
             return {
                 'statusCode': 500,
-                'headers': get_cors_headers(),
-                'body': json.dumps({'message': f'Error retrieving item from DynamoDB: {str(e)}'})
+                'headers': _CORS_HEADERS,
+                'body': _json_encoder.encode({'message': f'Failed to delete item from DynamoDB: {str(e)}'})
             }
-        #Delete from S3 audio file
-        s3_deleted = False
-        if s3_key:
-            try:
-                s3.delete_object(Bucket=bucket_name, Key=s3_key)
-                s3_deleted = True
-                print(f"S3 object {s3_key} deleted successfully.")
-            except Exception as e:
-                print(f"Error deleting S3 object {s3_key}: {str(e)}")
-        #Delete from S3 cover image file
-        if image_s3_key:
-            try:
-                s3.delete_object(Bucket=bucket_name, Key=image_s3_key)
-                print(f"S3 object {image_s3_key} deleted successfully.")
-            except Exception as e:
-                print(f"Error deleting S3 object {image_s3_key}: {str(e)}")
-        #Delete from DynamoDB
-        try:
-            table.delete_item(Key={'contentId': content_id})
-            print(f"DynamoDB item with contentId {content_id} deleted successfully.")
+        item = response.get('Attributes')
+        if not item:
             return {
-                'statusCode': 200,
-                'headers': get_cors_headers(),
-                'body': json.dumps({
-                    'message': f'Content "{title}" deleted successfully.',
-                })
-            }
-        except Exception as e:
-            print(f"Error deleting item from DynamoDB: {str(e)}")
-            return {
-                'statusCode': 500,
-                'headers': get_cors_headers(),
-                'body': json.dumps({'message': f'Failed to delete item from DynamoDB: {str(e)}', 's3_deleted': s3_deleted})
+                'statusCode': 404,
+                'headers': _CORS_HEADERS,
+                'body': _NOT_FOUND_BODY
             }
+        logger.info("DynamoDB item with contentId %s deleted successfully.", content_id)
+
+        # S3 cleanup and the genre version bump are independent - run them
+        # concurrently, but finish both before returning: Lambda freezes the
+        # environment once the response is sent, and work left pending then
+        # is lost if the environment is never invoked again
+        cleanup_future = CLEANUP_EXECUTOR.submit(
+            _delete_s3_objects,
+            content_id,
+            item.get('s3Key'),
+            item.get('coverImageS3Key') or item.get('imageS3Key')
+        )
+        version_future = CLEANUP_EXECUTOR.submit(bump_genre_registry_version, _get_genre_registry_table())
+        title = item.get('title', 'Unknown')
+        success_response = {
+            'statusCode': 200,
+            'headers': _CORS_HEADERS,
+            'body': _json_encoder.encode({
+                'message': f'Content "{title}" deleted successfully.',
+            })
+        }
+        wait([cleanup_future, version_future])
+        return success_response
     except Exception as e:
-        print(f"Unexpected error: {str(e)}")
+        logger.exception("Delete music content failed")
         return {
             'statusCode': 500,
-            'headers': get_cors_headers(),
-            'body': json.dumps({'message': f'Internal server error: {str(e)}'})
+            'headers': _CORS_HEADERS,
+            'body': _json_encoder.encode({'message': f'Internal server error: {str(e)}'})
         }
     
-def is_admin_user(event):
+def _delete_s3_objects(content_id, s3_key, image_s3_key):
+    """Delete the audio file and cover image in one request - failures are logged, not raised"""
+    objects = [{'Key': key} for key in (s3_key, image_s3_key) if key]
+    if not objects:
+        return
     try:
-        request_context = event.get('requestContext', {})
-        authorizer = request_context.get('authorizer', {})
-        
-        # Check if user is in administrators group
-        groups = authorizer.get('groups', '').split(',')
-        role = authorizer.get('role', '')
-        
-        return 'administrators' in groups or role == 'admin'
-        
-    except Exception as e:
-        print(f"Error checking admin role: {str(e)}")
-        return False
-    
-def get_cors_headers():
-    """Get CORS headers for API responses"""
-    return {
-        'Access-Control-Allow-Origin': '*',
-        'Access-Control-Allow-Headers': 'Content-Type,Authorization,X-Requested-With',
-        'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
-        'Content-Type': 'application/json'
-    }
\ No newline at end of file
+        result = _get_s3_client().delete_objects(Bucket=BUCKET_NAME, Delete={'Objects': objects, 'Quiet': True})
+    except (BotoCoreError, ClientError) as e:
+        logger.error("Error deleting S3 objects for %s: %s", content_id, e)
+        return
+    # Quiet mode only reports the keys that failed
+    for error in result.get('Errors', []):
+        logger.error("Error deleting S3 object %s: %s", error['Key'], error.get('Message'))
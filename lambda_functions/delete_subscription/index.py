@@ -1,13 +1,33 @@
 import json
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-dynamodb = boto3.resource('dynamodb')
+# Low-level client: the only call is a single-key delete, so the key is
+# marshalled by hand instead of going through the resource layer
+dynamodb_client = boto3.client(
+    'dynamodb',
+    config=Config(tcp_keepalive=True, max_pool_connections=2, retries={'mode': 'standard', 'max_attempts': 2})
+)
+lambda_client = boto3.client('lambda')
+
+SUBSCRIPTIONS_TABLE = os.environ['SUBSCRIPTIONS_TABLE']
+CALCULATE_FEED_FUNCTION = os.environ['CALCULATE_FEED_FUNCTION']
+
+_json_encoder = json.JSONEncoder(default=str, separators=(',', ':'))
+
+_CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization,X-Requested-With',
+    'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
+    'Content-Type': 'application/json'
+}
 
 def handler(event, context):
     """
@@ -15,8 +35,6 @@ def handler(event, context):
     Deletes a subscription by subscriptionId
     """
     
-    logger.info("Delete subscription request received")
-    
     try:
         # Parse path parameters (API Gateway path like /subscription/{subscriptionId})
         path_params = event.get('pathParameters') or {}
@@ -26,12 +44,10 @@ def handler(event, context):
             return create_error_response(400, "subscriptionId is required in path parameters")
         
         # Delete from DynamoDB
-        deleted_item = delete_subscription(subscription_id)
-        
-        if not deleted_item:
+        if not delete_subscription(subscription_id):
             return create_error_response(404, f"Subscription {subscription_id} not found")
         
-        logger.info(f"Subscription deleted successfully: {subscription_id}")
+        logger.info("Subscription deleted successfully: %s", subscription_id)
         
         request_context = event.get('requestContext', {})
         authorizer = request_context.get('authorizer', {})
@@ -46,75 +62,71 @@ def handler(event, context):
             'subscriptionId': subscription_id
         })
         
-    except Exception as e:
-        logger.error(f"Delete Subscription error: {str(e)}")
+    except Exception:
+        logger.exception("Delete subscription failed")
         return create_error_response(500, "Internal server error")
 
 def delete_subscription(subscription_id):
-    """Delete subscription from DynamoDB by subscriptionId"""
+    """
+    Delete subscription from DynamoDB by subscriptionId
+    The condition makes DynamoDB report a missing subscription, so the old
+    item does not have to be sent back. Returns False if it did not exist.
+    """
     try:
-        table = dynamodb.Table(os.environ['SUBSCRIPTIONS_TABLE'])
-        
-        # Delete item and return old values
-        response = table.delete_item(
-            Key={'subscriptionId': subscription_id},
-            ReturnValues='ALL_OLD'  # vraća obrisani item, None ako ne postoji
+        dynamodb_client.delete_item(
+            TableName=SUBSCRIPTIONS_TABLE,
+            Key={'subscriptionId': {'S': subscription_id}},
+            ConditionExpression='attribute_exists(subscriptionId)'
         )
+        return True
         
-        return response.get('Attributes')
-        
-    except Exception as e:
-        logger.error(f"Error deleting subscription: {str(e)}")
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return False
+        logger.error("Error deleting subscription: %s", e.response['Error']['Code'])
         raise
 
 def trigger_feed_calculation(username):
     """Trigger feed calculation after subscription update"""
     
-    lambda_client = boto3.client('lambda')
-    
     payload = {
         'username': username,
         'action': 'subscription_deleted',
-        'timestamp': datetime.now().isoformat()
+        'timestamp': _utcnow_iso()
     }
     
     # Invoke calculate feed function asynchronously
     lambda_client.invoke(
-        FunctionName=os.environ['CALCULATE_FEED_FUNCTION'],
+        FunctionName=CALCULATE_FEED_FUNCTION,
         InvocationType='Event',  # Async invocation
-        Payload=json.dumps(payload)
+        Payload=_json_encoder.encode(payload)
     )
     
-    print(f"Feed calculation triggered for user: {username}")
+    logger.info("Feed calculation triggered for user: %s", username)
 
 def create_success_response(status_code, data):
     """Create standardized success response"""
     return {
         'statusCode': status_code,
-        'headers': get_cors_headers(),
-        'body': json.dumps(data, default=str)
+        'headers': _CORS_HEADERS,
+        'body': _json_encoder.encode(data)
     }
 
 def create_error_response(status_code, message, details=None):
     """Create standardized error response"""
     error_data = {
         'error': message,
-        'timestamp': datetime.utcnow().isoformat()
+        'timestamp': _utcnow_iso()
     }
     if details:
         error_data['details'] = details
     
     return {
         'statusCode': status_code,
-        'headers': get_cors_headers(),
-        'body': json.dumps(error_data)
+        'headers': _CORS_HEADERS,
+        'body': _json_encoder.encode(error_data)
     }
 
-def get_cors_headers():
-    """Get CORS headers for API responses"""
-    return {
-        'Access-Control-Allow-Origin': '*',
-        'Access-Control-Allow-Headers': 'Content-Type,Authorization,X-Requested-With',
-        'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
-        'Content-Type': 'application/json'
-    }
+def _utcnow_iso():
+    """Current time as a timezone-aware UTC ISO 8601 string"""
+    return datetime.now(timezone.utc).isoformat()
@@ -1,17 +1,112 @@
 import json
 import boto3
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
 import os
+import time
 from datetime import datetime
 import logging
 import base64
-from typing import Dict, List, Any
-from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
 from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-dynamodb = boto3.resource('dynamodb')
+# Shared by the genre scans and the per-genre count queries in get_available_genres
+QUERY_WORKERS = 16
+# Parallel scan segments per table - the three fallback scans use 12 workers at once
+SCAN_SEGMENTS = 4
+QUERY_EXECUTOR = ThreadPoolExecutor(max_workers=QUERY_WORKERS)
+
+# Genre registry entity types - create_music_content, finalize_upload and
+# update_music_content register 'music', create_artist and create_album the others
+REGISTRY_ENTITY_TYPES = frozenset(('music', 'artist', 'album'))
+# Present once every genre already in the tables has been registered
+REGISTRY_BACKFILL_MARKER = {'entityType': 'registry', 'genre': 'backfilled'}
+# Counter the writers bump on every change that can alter genres or counts
+REGISTRY_VERSION_KEY = {'entityType': 'registry', 'genre': 'version'}
+
+# Genre listings change on a scale of minutes - warm containers serve them from
+# _CACHE (key -> (stored at, value)) instead of querying DynamoDB every request
+GENRES_CACHE_TTL = 300
+GENRE_COUNT_CACHE_TTL = 600
+_CACHE = {}
+# Registry version the cached genre data was built from
+_CACHE_VERSION = {'genres': None}
+
+def _json_default(obj):
+    """
+    Serialize what json cannot: DynamoDB numbers (Decimal, at any depth) as
+    floats, anything else as its string form
+    """
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return str(obj)
+
+_json_encoder = json.JSONEncoder(default=_json_default, separators=(',', ':'))
+
+# One pooled connection per query worker, so concurrent queries never wait for a socket
+_dynamodb_config = Config(
+    tcp_keepalive=True,
+    max_pool_connections=QUERY_WORKERS,
+    retries={'mode': 'standard', 'max_attempts': 2}
+)
+dynamodb = boto3.resource('dynamodb', config=_dynamodb_config)
+
+music_content_table = dynamodb.Table(os.environ['MUSIC_CONTENT_TABLE'])
+artists_table = dynamodb.Table(os.environ['ARTISTS_TABLE'])
+albums_table = dynamodb.Table(os.environ['ALBUMS_TABLE'])
+genre_registry_table = dynamodb.Table(os.environ['GENRE_REGISTRY_TABLE'])
+
+# The content queries skip the resource layer, which deserializes every
+# attribute of every item - only the attributes that are returned get converted.
+# A separate client: dynamodb.meta.client still (de)serializes every call, so it
+# would wrap the raw AttributeValues again and hand back plain Python values
+dynamodb_client = boto3.client('dynamodb', config=_dynamodb_config)
+_deserializer = TypeDeserializer()
+_serializer = TypeSerializer()
+
+# Fields returned for each entity, in response order, with the value used when
+# an item lacks one. The defaults are never mutated, so sharing them is safe
+CONTENT_RESPONSE_FIELDS = (
+    ('contentId', None), ('title', None), ('artistId', None), ('genre', None),
+    ('album', None), ('albumId', None), ('trackNumber', 0), ('filename', None),
+    ('fileType', None), ('fileSize', None), ('createdAt', None), ('lastModified', None),
+    ('coverImageUrl', None)
+)
+ARTIST_RESPONSE_FIELDS = (
+    ('artistId', None), ('name', None), ('biography', None), ('primaryGenre', None),
+    ('genres', []), ('country', ''), ('formedYear', None), ('imageUrl', ''),
+    ('metadata', {}), ('createdAt', None), ('updatedAt', None)
+)
+ALBUM_RESPONSE_FIELDS = (
+    ('albumId', None), ('title', None), ('artistId', None), ('genre', None),
+    ('description', ''), ('releaseYear', None), ('trackCount', 0), ('duration', 0),
+    ('coverImageUrl', ''), ('metadata', {}), ('recordLabel', ''), ('tags', []),
+    ('createdAt', None), ('updatedAt', None)
+)
+
+def _projection(fields):
+    """ProjectionExpression over the given response fields, with a #placeholder for each name"""
+    names = {f'#{field}': field for field, _ in fields}
+    return ', '.join(names), names
+
+# Queries read only the returned fields. Every name goes through a placeholder,
+# since several (name, duration, metadata, ...) are DynamoDB reserved words
+CONTENT_PROJECTION, CONTENT_PROJECTION_NAMES = _projection(CONTENT_RESPONSE_FIELDS)
+ARTIST_PROJECTION, ARTIST_PROJECTION_NAMES = _projection(ARTIST_RESPONSE_FIELDS)
+ALBUM_PROJECTION, ALBUM_PROJECTION_NAMES = _projection(ALBUM_RESPONSE_FIELDS)
+
+# Last path segment -> endpoint handler, built once per container. Lambdas
+# because the endpoint functions are defined further down the module
+_ROUTES = {
+    'genres': lambda query_params: get_available_genres(),
+    'content': lambda query_params: get_content_by_filters(query_params),
+    'artists': lambda query_params: get_artists_by_genre(query_params),
+    'albums': lambda query_params: get_albums_by_genre(query_params)  # Album discovery
+}
 
 def handler(event, context):
     """
@@ -33,87 +128,91 @@ def handler(event, context):
         path = event.get('path', '')
         query_params = event.get('queryStringParameters') or {}
         
-        # Route to appropriate handler based on path
-        if path.endswith('/genres'):
-            return get_available_genres()
-        elif path.endswith('/content'):
-            return get_content_by_filters(query_params)
-        elif path.endswith('/artists'):
-            return get_artists_by_genre(query_params)
-        elif path.endswith('/albums'):  # Album discovery
-            return get_albums_by_genre(query_params)
-        else:
+        # Route to appropriate handler based on the last path segment
+        route = _ROUTES.get(path.rsplit('/', 1)[-1])
+        if route is None:
             return create_error_response(400, "Invalid discover endpoint")
+        return route(query_params)
             
     except Exception as e:
-        logger.error(f"Discover error: {str(e)}")
+        logger.error("Discover error: %s", e)
         return create_error_response(500, "Internal server error")
 
 def get_available_genres():
+    """
+    Genre listing, served from the container cache while it is fresh
+    Once it expires, one GetItem on the registry version decides whether the
+    cached per-genre counts are still valid - any write since they were built
+    drops every cached genre entry
+    """
+    entry = _CACHE.get('genres')
+    if entry and time.monotonic() - entry[0] < GENRES_CACHE_TTL:
+        return entry[1]
+    version = read_genres_version()
+    if version != _CACHE_VERSION['genres']:
+        _CACHE.clear()
+        _CACHE_VERSION['genres'] = version
+    return _cached('genres', GENRES_CACHE_TTL, build_genres_response)
+
+def read_genres_version():
+    """Current registry version - the last seen one if it cannot be read"""
+    try:
+        response = genre_registry_table.get_item(Key=REGISTRY_VERSION_KEY)
+        return response.get('Item', {}).get('version')
+    except Exception as e:
+        logger.warning("Could not read genre registry version: %s", e)
+        return _CACHE_VERSION['genres']
+
+def build_genres_response():
     """
     Get all available genres from artists, albums, and music content
-    PERFORMANCE: Uses parallel queries to all tables for complete coverage
+    PERFORMANCE: Genres are read from the small genre registry instead of
+    scanning three tables, then every per-genre count query runs concurrently
     """
     try:
-        # Get genres from all tables in parallel for complete coverage
-        music_genres = set()
-        artist_genres = set()
-        album_genres = set()  # NEW: Include album genres
-        
-        # PERFORMANCE: Query music content genres using GSI
-        music_table = dynamodb.Table(os.environ['MUSIC_CONTENT_TABLE'])
-        
-        # Use scan with projection to get only genre field (minimal data transfer)
-        music_response = music_table.scan(
-            ProjectionExpression='genre',
-            FilterExpression='attribute_exists(genre) AND genre <> :empty',
-            ExpressionAttributeValues={':empty': ''}
-        )
-        
-        for item in music_response.get('Items', []):
-            if item.get('genre'):
-                music_genres.add(item['genre'].lower().strip())
-        
-        # PERFORMANCE: Query artist primary genres using GSI  
-        artists_table = dynamodb.Table(os.environ['ARTISTS_TABLE'])
-        
-        artist_response = artists_table.scan(
-            ProjectionExpression='primaryGenre, genres',
-            FilterExpression='attribute_exists(primaryGenre) AND primaryGenre <> :empty',
-            ExpressionAttributeValues={':empty': ''}
-        )
-        
-        for item in artist_response.get('Items', []):
-            if item.get('primaryGenre'):
-                artist_genres.add(item['primaryGenre'].lower().strip())
-            # Also include secondary genres
-            for genre in item.get('genres', []):
-                if genre and genre.strip():
-                    artist_genres.add(genre.lower().strip())
-        
-        # NEW: Query album genres using GSI
-        albums_table = dynamodb.Table(os.environ['ALBUMS_TABLE'])
-        
-        album_response = albums_table.scan(
-            ProjectionExpression='genre',
-            FilterExpression='attribute_exists(genre) AND genre <> :empty',
-            ExpressionAttributeValues={':empty': ''}
-        )
-        
-        for item in album_response.get('Items', []):
-            if item.get('genre'):
-                album_genres.add(item['genre'].lower().strip())
+        all_genres = load_registered_genres()
+        if all_genres is None:
+            # Registry not backfilled yet - scan the tables once and record what they hold.
+            # Every table is split into SCAN_SEGMENTS parallel scan segments
+            scanners = {
+                'music': scan_music_genres,
+                'artist': scan_artist_genres,
+                'album': scan_album_genres  # NEW: Include album genres
+            }
+            scan_futures = {
+                entity_type: [QUERY_EXECUTOR.submit(scanner, segment) for segment in range(SCAN_SEGMENTS)]
+                for entity_type, scanner in scanners.items()
+            }
+            genre_sets = {
+                entity_type: set().union(*(future.result() for future in futures))
+                for entity_type, futures in scan_futures.items()
+            }
+            backfill_genre_registry(genre_sets)
+            all_genres = {*genre_sets['music'], *genre_sets['artist'], *genre_sets['album']}
         
         # Combine and format genres
-        all_genres = sorted(list(music_genres.union(artist_genres).union(album_genres)))
+        all_genres = sorted(all_genres)
+        
+        # Get counts for each genre (each one is cached on its own)
+        count_futures = {
+            genre: (
+                QUERY_EXECUTOR.submit(get_content_count_by_genre, genre),
+                QUERY_EXECUTOR.submit(get_artist_count_by_genre, genre),
+                QUERY_EXECUTOR.submit(get_album_count_by_genre, genre)  # NEW: Album count
+            )
+            for genre in all_genres
+        }
         
         # Format genres with counts for better UX
         genre_data = []
         for genre in all_genres:
-            # Get counts for each genre (can be cached in production)
-            content_count = get_content_count_by_genre(genre)
-            artist_count = get_artist_count_by_genre(genre)
-            album_count = get_album_count_by_genre(genre)  # NEW: Album count
+            content_future, artist_future, album_future = count_futures[genre]
+            content_count = content_future.result()
+            artist_count = artist_future.result()
+            album_count = album_future.result()
+            # Registry entries are never removed - skip genres whose content was all deleted
+            if not content_count + artist_count + album_count:
+                continue
             
             genre_data.append({
                 'genre': genre.title(),
@@ -126,7 +225,7 @@ def get_available_genres():
         # Sort by total items descending for popular genres first
         genre_data.sort(key=lambda x: x['totalItems'], reverse=True)
         
-        logger.info(f"Retrieved {len(genre_data)} genres including albums")
+        logger.info("Retrieved %d genres including albums", len(genre_data))
         
         return create_success_response(200, {
             'message': 'Genres retrieved successfully',
@@ -135,9 +234,90 @@ def get_available_genres():
         })
         
     except Exception as e:
-        logger.error(f"Error getting genres: {str(e)}")
+        logger.error("Error getting genres: %s", e)
         raise
 
+def load_registered_genres():
+    """
+    Genres of every entity type from the genre registry, or None until the
+    registry has been backfilled from the existing tables
+    """
+    genres = set()
+    backfilled = False
+    for item in scan_all_items(genre_registry_table):
+        if item['entityType'] in REGISTRY_ENTITY_TYPES:
+            genres.add(item['genre'])
+        elif item == REGISTRY_BACKFILL_MARKER:
+            backfilled = True
+    
+    return genres if backfilled else None
+
+def backfill_genre_registry(genre_sets):
+    """Register the scanned genres, then mark the registry as complete"""
+    with genre_registry_table.batch_writer() as batch:
+        for entity_type, genres in genre_sets.items():
+            for genre in genres:
+                batch.put_item(Item={'entityType': entity_type, 'genre': genre})
+    # Written last, so a failed backfill is simply retried by the next request
+    genre_registry_table.put_item(Item=REGISTRY_BACKFILL_MARKER)
+    
+    logger.info("Genre registry backfilled with %d entries", sum(map(len, genre_sets.values())))
+
+def scan_all_items(table, **scan_params):
+    """Yield the items of every scan page - a single Scan call stops at 1 MB"""
+    while True:
+        response = table.scan(**scan_params)
+        yield from response.get('Items', [])
+        if 'LastEvaluatedKey' not in response:
+            return
+        scan_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def scan_music_genres(segment):
+    """Genres used by music content, from one parallel scan segment"""
+    # Use scan with projection to get only genre field (minimal data transfer)
+    music_items = scan_all_items(
+        music_content_table,
+        Segment=segment,
+        TotalSegments=SCAN_SEGMENTS,
+        ProjectionExpression='genre',
+        FilterExpression='attribute_exists(genre) AND genre <> :empty',
+        ExpressionAttributeValues={':empty': ''}
+    )
+    
+    return {genre.lower().strip() for item in music_items if (genre := item.get('genre'))}
+
+def scan_artist_genres(segment):
+    """Primary and secondary genres of artists, from one parallel scan segment"""
+    artist_items = scan_all_items(
+        artists_table,
+        Segment=segment,
+        TotalSegments=SCAN_SEGMENTS,
+        ProjectionExpression='primaryGenre, genres',
+        FilterExpression='attribute_exists(primaryGenre) AND primaryGenre <> :empty',
+        ExpressionAttributeValues={':empty': ''}
+    )
+    
+    # Primary genre followed by the secondary genres of every artist
+    return {
+        genre.lower().strip()
+        for item in artist_items
+        for genre in (item.get('primaryGenre'), *item.get('genres', []))
+        if genre and genre.strip()
+    }
+
+def scan_album_genres(segment):
+    """NEW: Genres used by albums, from one parallel scan segment"""
+    album_items = scan_all_items(
+        albums_table,
+        Segment=segment,
+        TotalSegments=SCAN_SEGMENTS,
+        ProjectionExpression='genre',
+        FilterExpression='attribute_exists(genre) AND genre <> :empty',
+        ExpressionAttributeValues={':empty': ''}
+    )
+    
+    return {genre.lower().strip() for item in album_items if (genre := item.get('genre'))}
+
 def get_content_by_filters(query_params):
     """
     Get content with performance-optimized filtering including album support
@@ -154,73 +334,83 @@ def get_content_by_filters(query_params):
         if not genre:
             return create_error_response(400, "Genre parameter is required")
         
-        table = dynamodb.Table(os.environ['MUSIC_CONTENT_TABLE'])
-        
         # Choose optimal GSI based on filters
         if album_id:
             # Album-based filtering using albumId-trackNumber-index
-            result = query_content_by_album(table, album_id, limit, last_key)
+            result = query_content_by_album(music_content_table, album_id, limit, last_key)
         elif artist_id:
             # PERFORMANCE: Use genre-artistId-index for dual filtering
-            result = query_content_by_genre_and_artist(table, genre, artist_id, limit, last_key, sort_by)
+            result = query_content_by_genre_and_artist(music_content_table, genre, artist_id, limit, last_key, sort_by)
         else:
             # PERFORMANCE: Use genre-createdAt-index for chronological content
-            result = query_content_by_genre_chronological(table, genre, limit, last_key, sort_by)
+            result = query_content_by_genre_chronological(music_content_table, genre, limit, last_key, sort_by)
         
-        logger.info(f"Retrieved {len(result['content'])} content items for genre: {genre}")
+        logger.info("Retrieved %d content items for genre: %s", len(result['content']), genre)
         
         return create_success_response(200, result)
         
     except Exception as e:
-        logger.error(f"Error getting filtered content: {str(e)}")
+        logger.error("Error getting filtered content: %s", e)
         raise
 
 def query_content_by_genre_and_artist(table, genre, artist_id, limit, last_key, sort_by):
     """PERFORMANCE: Query using genre-artistId-index"""
     
     query_params = {
+        'TableName': table.name,
         'IndexName': 'genre-artistId-index',
-        'KeyConditionExpression': Key('genre').eq(genre) & Key('artistId').eq(artist_id),
+        'KeyConditionExpression': '#genre = :genre AND #artistId = :artistId',
+        'ProjectionExpression': CONTENT_PROJECTION,
+        'ExpressionAttributeNames': CONTENT_PROJECTION_NAMES,  # Includes #genre and #artistId
+        'ExpressionAttributeValues': {':genre': {'S': genre}, ':artistId': {'S': artist_id}},
         'Limit': limit,
         'ScanIndexForward': sort_by != 'newest'  # False for newest first
     }
     
     if last_key:
-        query_params['ExclusiveStartKey'] = decode_last_key(last_key)
+        query_params['ExclusiveStartKey'] = decode_raw_last_key(last_key)
     
-    response = table.query(**query_params)
+    response = dynamodb_client.query(**query_params)
+    content = [transform_content_for_response(item) for item in response.get('Items') or []]
+    last_evaluated_key = response.get('LastEvaluatedKey')
     
     return {
         'message': f'Content retrieved for genre "{genre}" and artist',
-        'content': [transform_content_for_response(item) for item in response.get('Items', [])],
-        'count': len(response.get('Items', [])),
+        'content': content,
+        'count': len(content),
         'filters': {'genre': genre, 'artistId': artist_id, 'sortBy': sort_by},
-        'hasMore': 'LastEvaluatedKey' in response,
-        'lastKey': encode_last_key(response.get('LastEvaluatedKey')) if 'LastEvaluatedKey' in response else None
+        'hasMore': last_evaluated_key is not None,
+        'lastKey': encode_raw_last_key(last_evaluated_key)
     }
 
 def query_content_by_genre_chronological(table, genre, limit, last_key, sort_by):
     """PERFORMANCE: Query using genre-createdAt-index"""
     
     query_params = {
+        'TableName': table.name,
         'IndexName': 'genre-createdAt-index',
-        'KeyConditionExpression': Key('genre').eq(genre),
+        'KeyConditionExpression': '#genre = :genre',
+        'ProjectionExpression': CONTENT_PROJECTION,
+        'ExpressionAttributeNames': CONTENT_PROJECTION_NAMES,  # Includes #genre
+        'ExpressionAttributeValues': {':genre': {'S': genre}},
         'Limit': limit,
         'ScanIndexForward': sort_by != 'newest'  # False for newest first
     }
     
     if last_key:
-        query_params['ExclusiveStartKey'] = decode_last_key(last_key)
+        query_params['ExclusiveStartKey'] = decode_raw_last_key(last_key)
     
-    response = table.query(**query_params)
+    response = dynamodb_client.query(**query_params)
+    content = [transform_content_for_response(item) for item in response.get('Items') or []]
+    last_evaluated_key = response.get('LastEvaluatedKey')
     
     return {
         'message': f'Content retrieved for genre "{genre}"',
-        'content': [transform_content_for_response(item) for item in response.get('Items', [])],
-        'count': len(response.get('Items', [])),
+        'content': content,
+        'count': len(content),
         'filters': {'genre': genre, 'sortBy': sort_by},
-        'hasMore': 'LastEvaluatedKey' in response,
-        'lastKey': encode_last_key(response.get('LastEvaluatedKey')) if 'LastEvaluatedKey' in response else None
+        'hasMore': last_evaluated_key is not None,
+        'lastKey': encode_raw_last_key(last_evaluated_key)
     }
 
 def get_artists_by_genre(query_params):
@@ -236,12 +426,13 @@ def get_artists_by_genre(query_params):
         if not genre:
             return create_error_response(400, "Genre parameter is required")
         
-        table = dynamodb.Table(os.environ['ARTISTS_TABLE'])
-        
         # PERFORMANCE: Use primaryGenre-index for optimal query performance
         query_params = {
             'IndexName': 'primaryGenre-index',
-            'KeyConditionExpression': Key('primaryGenre').eq(genre),
+            'ProjectionExpression': ARTIST_PROJECTION,
+            'ExpressionAttributeNames': ARTIST_PROJECTION_NAMES,  # Includes #primaryGenre
+            'KeyConditionExpression': '#primaryGenre = :genre',
+            'ExpressionAttributeValues': {':genre': genre},
             'Limit': limit,
             'ScanIndexForward': True  # Ascending order by name
         }
@@ -249,23 +440,24 @@ def get_artists_by_genre(query_params):
         if last_key:
             query_params['ExclusiveStartKey'] = decode_last_key(last_key)
         
-        response = table.query(**query_params)
+        response = artists_table.query(**query_params)
         
-        artists = [transform_artist_for_response(item) for item in response.get('Items', [])]
+        artists = [transform_artist_for_response(item) for item in response.get('Items') or []]
+        last_evaluated_key = response.get('LastEvaluatedKey')
         
-        logger.info(f"Retrieved {len(artists)} artists for genre: {genre}")
+        logger.info("Retrieved %d artists for genre: %s", len(artists), genre)
         
         return create_success_response(200, {
             'message': f'Artists retrieved for genre "{genre}"',
             'artists': artists,
             'count': len(artists),
             'filters': {'genre': genre},
-            'hasMore': 'LastEvaluatedKey' in response,
-            'lastKey': encode_last_key(response.get('LastEvaluatedKey')) if 'LastEvaluatedKey' in response else None
+            'hasMore': last_evaluated_key is not None,
+            'lastKey': encode_last_key(last_evaluated_key)
         })
         
     except Exception as e:
-        logger.error(f"Error getting artists by genre: {str(e)}")
+        logger.error("Error getting artists by genre: %s", e)
         raise
 
 def get_albums_by_genre(query_params):
@@ -282,12 +474,13 @@ def get_albums_by_genre(query_params):
         if not genre:
             return create_error_response(400, "Genre parameter is required")
         
-        table = dynamodb.Table(os.environ['ALBUMS_TABLE'])
-        
         # PERFORMANCE: Use genre-createdAt-index for chronological albums
         query_params_db = {
             'IndexName': 'genre-createdAt-index',
-            'KeyConditionExpression': Key('genre').eq(genre),
+            'ProjectionExpression': ALBUM_PROJECTION,
+            'ExpressionAttributeNames': ALBUM_PROJECTION_NAMES,  # Includes #genre
+            'KeyConditionExpression': '#genre = :genre',
+            'ExpressionAttributeValues': {':genre': genre},
             'Limit': limit,
             'ScanIndexForward': sort_by != 'newest'  # False for newest first
         }
@@ -295,179 +488,182 @@ def get_albums_by_genre(query_params):
         if last_key:
             query_params_db['ExclusiveStartKey'] = decode_last_key(last_key)
         
-        response = table.query(**query_params_db)
+        response = albums_table.query(**query_params_db)
         
-        albums = [transform_album_for_response(item) for item in response.get('Items', [])]
+        albums = [transform_album_for_response(item) for item in response.get('Items') or []]
+        last_evaluated_key = response.get('LastEvaluatedKey')
         
-        logger.info(f"Retrieved {len(albums)} albums for genre: {genre}")
+        logger.info("Retrieved %d albums for genre: %s", len(albums), genre)
         
         return create_success_response(200, {
             'message': f'Albums retrieved for genre "{genre}"',
             'albums': albums,
             'count': len(albums),
             'filters': {'genre': genre, 'sortBy': sort_by},
-            'hasMore': 'LastEvaluatedKey' in response,
-            'lastKey': encode_last_key(response.get('LastEvaluatedKey')) if 'LastEvaluatedKey' in response else None
+            'hasMore': last_evaluated_key is not None,
+            'lastKey': encode_last_key(last_evaluated_key)
         })
         
     except Exception as e:
-        logger.error(f"Error getting albums by genre: {str(e)}")
+        logger.error("Error getting albums by genre: %s", e)
         raise
 
 def query_content_by_album(table, album_id, limit, last_key):
     """NEW: Query content by album using albumId-trackNumber-index"""
     
     query_params = {
+        'TableName': table.name,
         'IndexName': 'albumId-trackNumber-index',
-        'KeyConditionExpression': Key('albumId').eq(album_id),
+        'KeyConditionExpression': '#albumId = :albumId',
+        'ProjectionExpression': CONTENT_PROJECTION,
+        'ExpressionAttributeNames': CONTENT_PROJECTION_NAMES,  # Includes #albumId
+        'ExpressionAttributeValues': {':albumId': {'S': album_id}},
         'Limit': limit,
         'ScanIndexForward': True  # Ascending order by track number
     }
     
     if last_key:
-        query_params['ExclusiveStartKey'] = decode_last_key(last_key)
+        query_params['ExclusiveStartKey'] = decode_raw_last_key(last_key)
     
-    response = table.query(**query_params)
+    response = dynamodb_client.query(**query_params)
+    content = [transform_content_for_response(item) for item in response.get('Items') or []]
+    last_evaluated_key = response.get('LastEvaluatedKey')
     
     return {
         'message': f'Content retrieved for album',
-        'content': [transform_content_for_response(item) for item in response.get('Items', [])],
-        'count': len(response.get('Items', [])),
+        'content': content,
+        'count': len(content),
         'filters': {'albumId': album_id, 'sortBy': 'track_order'},
-        'hasMore': 'LastEvaluatedKey' in response,
-        'lastKey': encode_last_key(response.get('LastEvaluatedKey')) if 'LastEvaluatedKey' in response else None
+        'hasMore': last_evaluated_key is not None,
+        'lastKey': encode_raw_last_key(last_evaluated_key)
     }
 
 # Helper functions for performance optimization
 
+def _cached(key, ttl, fn):
+    """
+    Return the cached value for key if it is younger than ttl seconds,
+    otherwise call fn and cache its result. Exceptions are never cached.
+    """
+    now = time.monotonic()
+    entry = _CACHE.get(key)
+    if entry and now - entry[0] < ttl:
+        return entry[1]
+    value = fn()
+    _CACHE[key] = (now, value)
+    return value
+
 def get_content_count_by_genre(genre):
-    """Get count of content items for a genre (can be cached)"""
+    """Get count of content items for a genre (cached per container)"""
     try:
-        table = dynamodb.Table(os.environ['MUSIC_CONTENT_TABLE'])
-        response = table.query(
+        return _cached(f'content-count:{genre}', GENRE_COUNT_CACHE_TTL, lambda: music_content_table.query(
             IndexName='genre-createdAt-index',
-            KeyConditionExpression=Key('genre').eq(genre),
+            KeyConditionExpression='#genre = :genre',
+            ExpressionAttributeNames={'#genre': 'genre'},
+            ExpressionAttributeValues={':genre': genre},
             Select='COUNT'
-        )
-        return response['Count']
-    except:
+        )['Count'])
+    except (BotoCoreError, ClientError) as e:
+        # Throttling included - the genre is listed with a zero count rather than failing the listing
+        logger.warning("Could not count content for genre %s: %s", genre, e)
         return 0
 
 def get_artist_count_by_genre(genre):
-    """Get count of artists for a genre (can be cached)"""
+    """Get count of artists for a genre (cached per container)"""
     try:
-        table = dynamodb.Table(os.environ['ARTISTS_TABLE'])
-        response = table.query(
+        return _cached(f'artist-count:{genre}', GENRE_COUNT_CACHE_TTL, lambda: artists_table.query(
             IndexName='primaryGenre-index',
-            KeyConditionExpression=Key('primaryGenre').eq(genre),
+            KeyConditionExpression='#primaryGenre = :genre',
+            ExpressionAttributeNames={'#primaryGenre': 'primaryGenre'},
+            ExpressionAttributeValues={':genre': genre},
             Select='COUNT'
-        )
-        return response['Count']
-    except:
+        )['Count'])
+    except (BotoCoreError, ClientError) as e:
+        # Throttling included - the genre is listed with a zero count rather than failing the listing
+        logger.warning("Could not count artist for genre %s: %s", genre, e)
         return 0
 
 def get_album_count_by_genre(genre):
-    """NEW: Get count of albums for a genre (can be cached)"""
+    """NEW: Get count of albums for a genre (cached per container)"""
     try:
-        table = dynamodb.Table(os.environ['ALBUMS_TABLE'])
-        response = table.query(
+        return _cached(f'album-count:{genre}', GENRE_COUNT_CACHE_TTL, lambda: albums_table.query(
             IndexName='genre-createdAt-index',
-            KeyConditionExpression=Key('genre').eq(genre),
+            KeyConditionExpression='#genre = :genre',
+            ExpressionAttributeNames={'#genre': 'genre'},
+            ExpressionAttributeValues={':genre': genre},
             Select='COUNT'
-        )
-        return response['Count']
-    except:
+        )['Count'])
+    except (BotoCoreError, ClientError) as e:
+        # Throttling included - the genre is listed with a zero count rather than failing the listing
+        logger.warning("Could not count album for genre %s: %s", genre, e)
         return 0
 
 def transform_content_for_response(item):
-    """Transform DynamoDB content item to frontend-friendly format"""
-    # Convert Decimal to float for JSON serialization
-    for key, value in item.items():
-        if isinstance(value, Decimal):
-            item[key] = float(value)
-    
+    """
+    Transform a low-level DynamoDB content item to frontend-friendly format
+    Only the attributes returned to the client are deserialized
+    """
+    deserialize = _deserializer.deserialize
     return {
-        'contentId': item.get('contentId'),
-        'title': item.get('title'),
-        'artistId': item.get('artistId'),
-        'genre': item.get('genre'),
-        'album': item.get('album'),
-        'albumId': item.get('albumId'),
-        'trackNumber': item.get('trackNumber', 0),
-        'filename': item.get('filename'),
-        'fileType': item.get('fileType'),
-        'fileSize': item.get('fileSize'),
-        'createdAt': item.get('createdAt'),
-        'lastModified': item.get('lastModified'),
-        'coverImageUrl': item.get('coverImageUrl')
+        field: deserialize(item[field]) if field in item else default
+        for field, default in CONTENT_RESPONSE_FIELDS
     }
 
 def transform_artist_for_response(item):
     """Transform DynamoDB artist item to frontend-friendly format"""
-    return {
-        'artistId': item.get('artistId'),
-        'name': item.get('name'),
-        'biography': item.get('biography'),
-        'primaryGenre': item.get('primaryGenre'),
-        'genres': item.get('genres', []),
-        'country': item.get('country', ''),
-        'formedYear': item.get('formedYear'),
-        'imageUrl': item.get('imageUrl', ''),
-        'metadata': item.get('metadata', {}),
-        'createdAt': item.get('createdAt'),
-        'updatedAt': item.get('updatedAt')
-    }
+    get = item.get
+    return {field: get(field, default) for field, default in ARTIST_RESPONSE_FIELDS}
 
 def transform_album_for_response(item):
     """Transform DynamoDB album item to frontend-friendly format"""
-    # Convert Decimal to float for JSON serialization
-    for key, value in item.items():
-        if isinstance(value, Decimal):
-            item[key] = float(value)
-    
-    return {
-        'albumId': item.get('albumId'),
-        'title': item.get('title'),
-        'artistId': item.get('artistId'),
-        'genre': item.get('genre'),
-        'description': item.get('description', ''),
-        'releaseYear': item.get('releaseYear'),
-        'trackCount': item.get('trackCount', 0),
-        'duration': item.get('duration', 0),
-        'coverImageUrl': item.get('coverImageUrl', ''),
-        'metadata': item.get('metadata', {}),
-        'recordLabel': item.get('recordLabel', ''),
-        'tags': item.get('tags', []),
-        'createdAt': item.get('createdAt'),
-        'updatedAt': item.get('updatedAt')
-    }
+    get = item.get
+    return {field: get(field, default) for field, default in ALBUM_RESPONSE_FIELDS}
 
 def encode_last_key(last_key):
-    """Encode last key for pagination"""
+    """
+    Encode last key for pagination
+    Unpadded URL-safe base64, so the token goes into a query string as-is
+    """
     if not last_key:
         return None
     try:
-        return base64.b64encode(
-            json.dumps(last_key, default=str).encode('utf-8')
-        ).decode('utf-8')
-    except:
+        return base64.urlsafe_b64encode(
+            _json_encoder.encode(last_key).encode('utf-8')
+        ).rstrip(b'=').decode('ascii')
+    except (TypeError, ValueError):
         return None
 
 def decode_last_key(last_key):
-    """Decode last key for pagination"""
+    """Decode last key for pagination - also accepts older standard base64 tokens"""
     if not last_key:
         return None
     try:
-        return json.loads(base64.b64decode(last_key).decode('utf-8'))
-    except:
+        key_json = base64.urlsafe_b64decode(last_key + '=' * (-len(last_key) % 4))
+        # Number key attributes (e.g. trackNumber) must go back to DynamoDB as Decimals
+        return json.loads(key_json, parse_float=Decimal, parse_int=Decimal)
+    except ValueError:
+        # Malformed base64, UTF-8 or JSON - binascii.Error and JSONDecodeError are ValueErrors
         return None
 
+def encode_raw_last_key(last_key):
+    """Encode a low-level LastEvaluatedKey - same token format as encode_last_key"""
+    if not last_key:
+        return None
+    return encode_last_key({name: _deserializer.deserialize(value) for name, value in last_key.items()})
+
+def decode_raw_last_key(last_key):
+    """Decode a pagination token into a low-level ExclusiveStartKey"""
+    key = decode_last_key(last_key)
+    if key is None:
+        return None
+    return {name: _serializer.serialize(value) for name, value in key.items()}
+
 def create_success_response(status_code, data):
     """Create standardized success response"""
     return {
         'statusCode': status_code,
         'headers': get_cors_headers(),
-        'body': json.dumps(data, default=str)
+        'body': _json_encoder.encode(data)
     }
 
 def create_error_response(status_code, message, details=None):
@@ -482,7 +678,7 @@ def create_error_response(status_code, message, details=None):
     return {
         'statusCode': status_code,
         'headers': get_cors_headers(),
-        'body': json.dumps(error_data)
+        'body': _json_encoder.encode(error_data)
     }
 
 def get_cors_headers():
@@ -492,4 +688,14 @@ def get_cors_headers():
         'Access-Control-Allow-Headers': 'Content-Type,Authorization,X-Requested-With',
         'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
         'Content-Type': 'application/json'
-    }
\ No newline at end of file
+    }
+
+# Provisioned-concurrency environments are initialised before any request
+# arrives - build and serialize the genre listing during that free init phase,
+# so the first /discover/genres request is a cache hit. The rebuild after
+# GENRES_CACHE_TTL or a registry version change happens in the handler as usual
+if os.environ.get('AWS_LAMBDA_INITIALIZATION_TYPE') == 'provisioned-concurrency':
+    try:
+        get_available_genres()
+    except Exception as e:
+        logger.warning("Warm-up failed: %s", e)
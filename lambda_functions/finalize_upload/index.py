@@ -0,0 +1,219 @@
+import json
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+import os
+from datetime import datetime, timezone
+import logging
+from shared.utils import COVER_IMAGE_URL_EXPIRY, get_file_extension, normalize_genre, register_genres
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+dynamodb = boto3.resource(
+    'dynamodb',
+    config=Config(tcp_keepalive=True, retries={'mode': 'standard', 'max_attempts': 2})
+)
+s3_client = boto3.client(
+    's3',
+    config=Config(signature_version='s3v4', tcp_keepalive=True, retries={'mode': 'standard', 'max_attempts': 3})
+)
+
+music_content_table = dynamodb.Table(os.environ['MUSIC_CONTENT_TABLE'])
+genre_registry_table = dynamodb.Table(os.environ['GENRE_REGISTRY_TABLE'])
+BUCKET_NAME = os.environ['MUSIC_CONTENT_BUCKET']
+ALLOWED_FILE_TYPES = frozenset(os.environ['ALLOWED_FILE_TYPES'].split(','))
+ALLOWED_IMAGE_TYPES = frozenset(os.environ['ALLOWED_IMAGE_TYPES'].split(','))
+
+_json_encoder = json.JSONEncoder(default=str, separators=(',', ':'))
+
+_CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization,X-Requested-With',
+    'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
+    'Content-Type': 'application/json'
+}
+
+if os.environ.get('AWS_LAMBDA_INITIALIZATION_TYPE') == 'provisioned-concurrency':
+    try:
+        dynamodb.meta.client.describe_table(TableName=music_content_table.name)
+        s3_client.head_bucket(Bucket=BUCKET_NAME)
+    except Exception as e:
+        logger.warning("Warm-up failed: %s", e)
+
+def handler(event, context):
+    """
+    Finalize Upload Handler
+    Records the music content item once the browser has uploaded the files
+    issued by init_upload. Size and type are taken from the stored S3
+    objects, so the item reflects what actually landed in the bucket.
+    """
+    try:
+        # Admin check - 'groups' is the comma-separated list set by the authorizer
+        authorizer = (event.get('requestContext') or {}).get('authorizer') or {}
+        if authorizer.get('role') != 'admin' and ',administrators,' not in f",{authorizer.get('groups') or ''},":
+            return {
+                'statusCode': 403,
+                'headers': _CORS_HEADERS,
+                'body': _json_encoder.encode({'message': 'Access denied. Administrator role required.'})
+            }
+
+        if not event.get('body'):
+            return {
+                "statusCode": 400,
+                'headers': _CORS_HEADERS,
+                "body": _json_encoder.encode({"message": "Request body is required"})
+            }
+
+        body = json.loads(event['body'])
+        content_id = body.get('contentId')
+        metadata = body.get('metadata') or {}
+        audio_file = body.get('audioFile') or {}
+        cover_image = body.get('coverImage')
+
+        if not content_id or not audio_file.get('filename'):
+            return {
+                "statusCode": 400,
+                'headers': _CORS_HEADERS,
+                "body": _json_encoder.encode({"message": "Missing contentId or audioFile filename"})
+            }
+
+        for field in ("title", "artistId"):
+            if field not in metadata:
+                return {
+                    "statusCode": 400,
+                    'headers': _CORS_HEADERS,
+                    "body": _json_encoder.encode({"message": f"Missing required field: {field}"})
+                }
+
+        file_key = f"music-content/{content_id}/{audio_file['filename']}"
+        file_object = _head_uploaded_object(file_key, audio_file.get('etag'))
+        if not file_object:
+            return {
+                "statusCode": 400,
+                'headers': _CORS_HEADERS,
+                "body": _json_encoder.encode({"message": "Audio file has not been uploaded or does not match"})
+            }
+
+        # The POST policy already pins these - re-checked in case the object was replaced
+        file_content_type = file_object['ContentType']
+        if file_content_type not in ALLOWED_FILE_TYPES:
+            return {
+                "statusCode": 400,
+                'headers': _CORS_HEADERS,
+                "body": _json_encoder.encode({"message": f"Unsupported audio file type: {file_content_type}"})
+            }
+
+        cover_image_key = None
+        if cover_image:
+            image_content_type = cover_image.get('contentType', '')
+            if image_content_type not in ALLOWED_IMAGE_TYPES:
+                return {
+                    "statusCode": 400,
+                    'headers': _CORS_HEADERS,
+                    "body": _json_encoder.encode({"message": f"Unsupported cover image file type: {image_content_type}"})
+                }
+
+            image_extension = get_file_extension(cover_image.get('filename') or '', image_content_type)
+            cover_image_key = f"music-content/{content_id}/cover{image_extension}"
+            if not _head_uploaded_object(cover_image_key, cover_image.get('etag')):
+                return {
+                    "statusCode": 400,
+                    'headers': _CORS_HEADERS,
+                    "body": _json_encoder.encode({"message": "Cover image has not been uploaded or does not match"})
+                }
+
+        current_time = datetime.now(timezone.utc).isoformat()
+
+        # DISCOVER OPTIMIZATION: Normalize genre for consistent filtering
+        normalized_genre = normalize_genre(metadata.get('genre', 'unknown'))
+
+        album_id = metadata.get('albumId')
+        track_number = metadata.get('trackNumber', 0)
+
+        item = {
+            'contentId': content_id,
+            'title': metadata['title'],
+            'artistId': metadata['artistId'],
+            'filename': audio_file['filename'],
+            'fileType': file_content_type,
+            'fileSize': file_object['ContentLength'],
+            's3Key': file_key,
+            'bucketName': BUCKET_NAME,
+            'createdAt': current_time,
+            'lastModified': current_time,
+            'genre': normalized_genre
+        }
+
+        if album_id:
+            item['albumId'] = album_id
+            item['trackNumber'] = int(track_number) if track_number else 0
+
+        if cover_image_key:
+            item['coverImageS3Key'] = cover_image_key
+            item['coverImageUrl'] = s3_client.generate_presigned_url(
+                'get_object',
+                Params={'Bucket': BUCKET_NAME, 'Key': cover_image_key},
+                ExpiresIn=COVER_IMAGE_URL_EXPIRY
+            )
+            item['coverImageContentType'] = image_content_type
+
+        if metadata.get('album'): # Keep for backward compatibility
+            item['album'] = metadata['album']
+
+        try:
+            music_content_table.put_item(
+                Item=item,
+                ConditionExpression='attribute_not_exists(contentId)'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return {
+                    "statusCode": 409,
+                    'headers': _CORS_HEADERS,
+                    "body": _json_encoder.encode({"message": "Music content has already been finalized"})
+                }
+            raise
+
+        register_genres(genre_registry_table, 'music', [normalized_genre])
+
+        return {
+            "statusCode": 201,
+            'headers': _CORS_HEADERS,
+            "body": _json_encoder.encode({
+                "message": "Music content created successfully",
+                "contentId": content_id,
+                "fileSize": item['fileSize'],
+                "createdAt": current_time
+            })
+        }
+    except json.JSONDecodeError:
+        return {
+            "statusCode": 400,
+            'headers': _CORS_HEADERS,
+            "body": _json_encoder.encode({"message": "Invalid JSON in request body"})
+        }
+    except Exception:
+        logger.exception("Finalize upload failed")
+        return {
+            "statusCode": 500,
+            'headers': _CORS_HEADERS,
+            "body": _json_encoder.encode({"message": "Internal server error"})
+        }
+
+def _head_uploaded_object(key, expected_etag=None):
+    """
+    Return the HEAD response for an uploaded object, or None if it is missing
+    or its ETag differs from the one the client received from S3.
+    """
+    try:
+        response = s3_client.head_object(Bucket=BUCKET_NAME, Key=key)
+    except ClientError as e:
+        if e.response['Error']['Code'] in ('404', 'NoSuchKey', 'NotFound'):
+            return None
+        raise
+
+    if expected_etag and expected_etag.strip('"') != response['ETag'].strip('"'):
+        return None
+    return response
+
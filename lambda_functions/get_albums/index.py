@@ -1,16 +1,45 @@
 import json
 import boto3
+from botocore.config import Config
 import os
 from datetime import datetime
 import logging
 import base64
+import time
 from boto3.dynamodb.conditions import Key
 from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-dynamodb = boto3.resource('dynamodb')
+_json_encoder = json.JSONEncoder(default=str, separators=(',', ':'))
+
+dynamodb = boto3.resource(
+    'dynamodb',
+    config=Config(tcp_keepalive=True, retries={'mode': 'standard', 'max_attempts': 2})
+)
+
+albums_table = dynamodb.Table(os.environ['ALBUMS_TABLE'])
+music_content_table = dynamodb.Table(os.environ['MUSIC_CONTENT_TABLE'])
+
+# Responses served from memory for RESPONSE_CACHE_TTL seconds - popular album,
+# artist and genre pages are requested far more often than albums change.
+# _CACHE maps (endpoint, query params) -> (stored at, response)
+RESPONSE_CACHE_TTL = 30
+RESPONSE_CACHE_MAX_ENTRIES = 1024
+_CACHE = {}
+
+# Fetches an album and its tracks side by side
+DETAIL_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+
+# Open the DynamoDB connection during provisioned-concurrency init, so the
+# two parallel album-detail requests do not both pay for it
+if os.environ.get('AWS_LAMBDA_INITIALIZATION_TYPE') == 'provisioned-concurrency':
+    try:
+        dynamodb.meta.client.describe_table(TableName=albums_table.name)
+    except Exception as e:
+        logger.warning("Warm-up failed: %s", e)
 
 def handler(event, context):
     """
@@ -35,13 +64,19 @@ def handler(event, context):
         genre = query_params.get('genre')
         
         if album_id:
-            return get_album_by_id(album_id)
+            cache_key = ('album', album_id)
+            fetch = lambda: get_album_by_id(album_id)
         elif artist_id:
-            return get_albums_by_artist(query_params)
+            cache_key = ('artist', artist_id, query_params.get('limit'), query_params.get('lastKey'), query_params.get('sortBy'))
+            fetch = lambda: get_albums_by_artist(query_params)
         elif genre:
-            return get_albums_by_genre(query_params)
+            cache_key = ('genre', genre.lower().strip(), query_params.get('limit'), query_params.get('lastKey'), query_params.get('sortBy'))
+            fetch = lambda: get_albums_by_genre(query_params)
         else:
-            return get_all_albums(query_params)
+            cache_key = ('all', query_params.get('limit'), query_params.get('lastKey'))
+            fetch = lambda: get_all_albums(query_params)
+        
+        return _cached_response(cache_key, fetch)
             
     except Exception as e:
         logger.error(f"Get albums error: {str(e)}")
@@ -50,17 +85,16 @@ def handler(event, context):
 def get_album_by_id(album_id):
     """Get specific album by ID"""
     try:
-        table = dynamodb.Table(os.environ['ALBUMS_TABLE'])
-        
-        response = table.get_item(Key={'albumId': album_id})
+        # PERFORMANCE: Album and track lookups are independent - run them concurrently
+        tracks_future = DETAIL_EXECUTOR.submit(get_album_tracks, album_id)
+        response = albums_table.get_item(Key={'albumId': album_id})
         
         if 'Item' not in response:
             return create_error_response(404, "Album not found")
         
         album = transform_album_for_response(response['Item'])
         
-        # Get album tracks
-        tracks = get_album_tracks(album_id)
+        tracks = tracks_future.result()
         album['tracks'] = tracks
         album['actualTrackCount'] = len(tracks)
         
@@ -86,8 +120,6 @@ def get_albums_by_artist(query_params):
         last_key = query_params.get('lastKey')
         sort_by = query_params.get('sortBy', 'newest')  # newest, oldest
         
-        table = dynamodb.Table(os.environ['ALBUMS_TABLE'])
-        
         # PERFORMANCE: Use artistId-createdAt-index for optimal query
         query_params_db = {
             'IndexName': 'artistId-createdAt-index',
@@ -99,7 +131,7 @@ def get_albums_by_artist(query_params):
         if last_key:
             query_params_db['ExclusiveStartKey'] = decode_last_key(last_key)
         
-        response = table.query(**query_params_db)
+        response = albums_table.query(**query_params_db)
         
         albums = [transform_album_for_response(item) for item in response.get('Items', [])]
         
@@ -132,8 +164,6 @@ def get_albums_by_genre(query_params):
         if not genre:
             return create_error_response(400, "Genre parameter is required")
         
-        table = dynamodb.Table(os.environ['ALBUMS_TABLE'])
-        
         # PERFORMANCE: Use genre-createdAt-index for chronological albums
         query_params_db = {
             'IndexName': 'genre-createdAt-index',
@@ -145,7 +175,7 @@ def get_albums_by_genre(query_params):
         if last_key:
             query_params_db['ExclusiveStartKey'] = decode_last_key(last_key)
         
-        response = table.query(**query_params_db)
+        response = albums_table.query(**query_params_db)
         
         albums = [transform_album_for_response(item) for item in response.get('Items', [])]
         
@@ -166,32 +196,28 @@ def get_albums_by_genre(query_params):
         raise
 
 def get_all_albums(query_params):
-    """Get all albums with pagination"""
+    """
+    Get all active albums with pagination
+    PERFORMANCE: Uses status-createdAt-index - newest first, no table scan
+    """
     try:
         limit = min(int(query_params.get('limit', 20)), 100)
         last_key = query_params.get('lastKey')
         
-        table = dynamodb.Table(os.environ['ALBUMS_TABLE'])
-        
-        scan_params = {
+        # PERFORMANCE: Limit applies to matching albums only, so every page is full
+        query_params_db = {
+            'IndexName': 'status-createdAt-index',
+            'KeyConditionExpression': Key('status').eq('active'),
             'Limit': limit,
-            'FilterExpression': '#status = :status',
-            'ExpressionAttributeNames': {'#status': 'status'},
-            'ExpressionAttributeValues': {':status': 'active'}
+            'ScanIndexForward': False  # Newest first
         }
         
         if last_key:
-            scan_params['ExclusiveStartKey'] = decode_last_key(last_key)
-        
-        response = table.scan(**scan_params)
+            query_params_db['ExclusiveStartKey'] = decode_last_key(last_key)
         
-        albums = []
-        for item in response.get('Items', []):
-            album = transform_album_for_response(item)
-            albums.append(album)
+        response = albums_table.query(**query_params_db)
         
-        # Sort by creation date for consistent ordering
-        albums.sort(key=lambda x: x['createdAt'], reverse=True)
+        albums = [transform_album_for_response(item) for item in response.get('Items', [])]
         
         logger.info(f"Retrieved {len(albums)} albums")
         
@@ -210,33 +236,24 @@ def get_all_albums(query_params):
 def get_album_tracks(album_id):
     """Get tracks for a specific album"""
     try:
-        table = dynamodb.Table(os.environ['MUSIC_CONTENT_TABLE'])
-        
         # PERFORMANCE: Use albumId-trackNumber-index for ordered track listing
-        response = table.query(
+        response = music_content_table.query(
             IndexName='albumId-trackNumber-index',
             KeyConditionExpression=Key('albumId').eq(album_id),
             ScanIndexForward=True  # Ascending order by track number
         )
         
-        tracks = []
-        for item in response.get('Items', []):
-            # Convert Decimal to float for JSON serialization
-            for key, value in item.items():
-                if isinstance(value, Decimal):
-                    item[key] = float(value)
-            
-            track = {
+        return [
+            _top_level_floats({
                 'contentId': item.get('contentId'),
                 'title': item.get('title'),
                 'trackNumber': item.get('trackNumber', 0),
                 'duration': item.get('duration', 0),
                 'fileType': item.get('fileType'),
                 'createdAt': item.get('createdAt')
-            }
-            tracks.append(track)
-        
-        return tracks
+            })
+            for item in response.get('Items', [])
+        ]
         
     except Exception as e:
         logger.error(f"Error getting album tracks: {str(e)}")
@@ -244,12 +261,7 @@ def get_album_tracks(album_id):
 
 def transform_album_for_response(item):
     """Transform DynamoDB album item to frontend-friendly format"""
-    # Convert Decimal to float for JSON serialization
-    for key, value in item.items():
-        if isinstance(value, Decimal):
-            item[key] = float(value)
-    
-    return {
+    return _top_level_floats({
         'albumId': item.get('albumId'),
         'title': item.get('title'),
         'artistId': item.get('artistId'),
@@ -267,7 +279,34 @@ def transform_album_for_response(item):
         'producer': item.get('producer', ''),
         'tags': item.get('tags', []),
         'isExplicit': item.get('isExplicit', False)
-    }
+    })
+
+def _top_level_floats(record):
+    """
+    DynamoDB numbers directly on a response record go out as floats; nested ones
+    (metadata, tags) keep the default=str form. Only the returned fields are
+    walked, not every attribute of the item
+    """
+    return {key: float(value) if isinstance(value, Decimal) else value for key, value in record.items()}
+
+def _cached_response(key, fn):
+    """
+    Return the cached response for key if it is younger than RESPONSE_CACHE_TTL,
+    otherwise call fn. Only successful responses are cached, body already
+    serialized, so hits skip both DynamoDB and JSON encoding.
+    """
+    now = time.monotonic()
+    entry = _CACHE.get(key)
+    if entry and now - entry[0] < RESPONSE_CACHE_TTL:
+        return entry[1]
+    response = fn()
+    if response['statusCode'] == 200:
+        _CACHE.pop(key, None)
+        if len(_CACHE) >= RESPONSE_CACHE_MAX_ENTRIES:
+            # Oldest entry first - dicts keep insertion order
+            del _CACHE[next(iter(_CACHE))]
+        _CACHE[key] = (now, response)
+    return response
 
 def encode_last_key(last_key):
     """Encode last key for pagination"""
@@ -294,7 +333,7 @@ def create_success_response(status_code, data):
     return {
         'statusCode': status_code,
         'headers': get_cors_headers(),
-        'body': json.dumps(data, default=str)
+        'body': _json_encoder.encode(data)
     }
 
 def create_error_response(status_code, message, details=None):
@@ -309,7 +348,7 @@ def create_error_response(status_code, message, details=None):
     return {
         'statusCode': status_code,
         'headers': get_cors_headers(),
-        'body': json.dumps(error_data)
+        'body': _json_encoder.encode(error_data)
     }
 
 def get_cors_headers():
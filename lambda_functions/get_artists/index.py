@@ -1,13 +1,29 @@
 import json
 import boto3
+from botocore.config import Config
 import os
 from datetime import datetime
 import logging
+import time
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-dynamodb = boto3.resource('dynamodb')
+_json_encoder = json.JSONEncoder(default=str, separators=(',', ':'))
+
+dynamodb = boto3.resource(
+    'dynamodb',
+    config=Config(tcp_keepalive=True, retries={'mode': 'standard', 'max_attempts': 2})
+)
+
+artists_table = dynamodb.Table(os.environ['ARTISTS_TABLE'])
+
+# Responses served from memory for RESPONSE_CACHE_TTL seconds - the same artist
+# pages are requested far more often than artists change.
+# _CACHE maps query params -> (stored at, response)
+RESPONSE_CACHE_TTL = 30
+RESPONSE_CACHE_MAX_ENTRIES = 1024
+_CACHE = {}
 
 def handler(event, context):
     """
@@ -29,6 +45,12 @@ def handler(event, context):
         if limit > 100:
             limit = 100  # Maximum limit of 100
         
+        cache_key = (limit, last_key, genre_filter, artist_id)
+        now = time.monotonic()
+        entry = _CACHE.get(cache_key)
+        if entry and now - entry[0] < RESPONSE_CACHE_TTL:
+            return entry[1]
+        
         # Get artists from DynamoDB
         artists_data = get_artists(limit, last_key, genre_filter, artist_id)
         
@@ -44,7 +66,14 @@ def handler(event, context):
         if artists_data.get('lastKey'):
             response_data['lastKey'] = artists_data['lastKey']
         
-        return create_success_response(200, response_data)
+        # Body is cached already serialized, so hits skip JSON encoding too
+        response = create_success_response(200, response_data)
+        _CACHE.pop(cache_key, None)
+        if len(_CACHE) >= RESPONSE_CACHE_MAX_ENTRIES:
+            # Oldest entry first - dicts keep insertion order
+            del _CACHE[next(iter(_CACHE))]
+        _CACHE[cache_key] = (now, response)
+        return response
         
     except Exception as e:
         logger.error(f"Get artists error: {str(e)}")
@@ -53,8 +82,6 @@ def handler(event, context):
 def get_artists(limit, last_key=None, genre_filter=None, artist_id=None):
     """Get artists from DynamoDB with optional pagination and filtering"""
     try:
-        table = dynamodb.Table(os.environ['ARTISTS_TABLE'])
-        
         # Scan parameters
         scan_params = {
             'Limit': limit,
@@ -83,7 +110,7 @@ def get_artists(limit, last_key=None, genre_filter=None, artist_id=None):
                 logger.warning(f"Invalid lastKey format: {str(e)}")
         
         # Perform scan
-        response = table.scan(**scan_params)
+        response = artists_table.scan(**scan_params)
         
         # Transform artists data for frontend
         artists = []
@@ -140,7 +167,7 @@ def create_success_response(status_code, data):
     return {
         'statusCode': status_code,
         'headers': get_cors_headers(),
-        'body': json.dumps(data, default=str)
+        'body': _json_encoder.encode(data)
     }
 
 def create_error_response(status_code, message, details=None):
@@ -155,7 +182,7 @@ def create_error_response(status_code, message, details=None):
     return {
         'statusCode': status_code,
         'headers': get_cors_headers(),
-        'body': json.dumps(error_data)
+        'body': _json_encoder.encode(error_data)
     }
 
 def get_cors_headers():
@@ -0,0 +1,152 @@
+import json
+import boto3
+from botocore.config import Config
+import os
+import logging
+from shared.utils import COVER_IMAGE_CACHE_CONTROL, get_file_extension, uuid7
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+s3_client = boto3.client(
+    's3',
+    config=Config(signature_version='s3v4', tcp_keepalive=True, retries={'mode': 'standard', 'max_attempts': 3})
+)
+
+BUCKET_NAME = os.environ['MUSIC_CONTENT_BUCKET']
+ALLOWED_FILE_TYPES = frozenset(os.environ['ALLOWED_FILE_TYPES'].split(','))
+ALLOWED_IMAGE_TYPES = frozenset(os.environ['ALLOWED_IMAGE_TYPES'].split(','))
+MAX_FILE_SIZE = int(os.environ['MAX_FILE_SIZE'])
+MAX_IMAGE_SIZE = int(os.environ.get('MAX_IMAGE_SIZE', '5242880')) # Default 5MB
+UPLOAD_URL_EXPIRY = 900 # 15 minutes
+
+_json_encoder = json.JSONEncoder(default=str, separators=(',', ':'))
+
+_CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,Authorization,X-Requested-With',
+    'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
+    'Content-Type': 'application/json'
+}
+
+def handler(event, context):
+    """
+    Init Upload Handler
+    Issues presigned POST forms so the browser uploads the audio file and
+    cover image straight to S3 - file bytes never pass through API Gateway
+    or Lambda. S3 enforces the size limit and content type via the POST
+    policy. The returned contentId is sent to finalize_upload afterwards.
+    """
+    try:
+        # Admin check - 'groups' is the comma-separated list set by the authorizer
+        authorizer = (event.get('requestContext') or {}).get('authorizer') or {}
+        if authorizer.get('role') != 'admin' and ',administrators,' not in f",{authorizer.get('groups') or ''},":
+            return {
+                'statusCode': 403,
+                'headers': _CORS_HEADERS,
+                'body': _json_encoder.encode({'message': 'Access denied. Administrator role required.'})
+            }
+
+        if not event.get('body'):
+            return {
+                "statusCode": 400,
+                'headers': _CORS_HEADERS,
+                "body": _json_encoder.encode({"message": "Request body is required"})
+            }
+
+        body = json.loads(event['body'])
+        metadata = body.get('metadata') or {}
+        audio_file = body.get('audioFile') or {}
+        cover_image = body.get('coverImage')
+
+        # Fail fast on metadata so nothing is uploaded for a request finalize would reject
+        for field in ("title", "artistId"):
+            if field not in metadata:
+                return {
+                    "statusCode": 400,
+                    'headers': _CORS_HEADERS,
+                    "body": _json_encoder.encode({"message": f"Missing required field: {field}"})
+                }
+
+        filename = audio_file.get('filename')
+        if not filename or not isinstance(filename, str):
+            return {
+                "statusCode": 400,
+                'headers': _CORS_HEADERS,
+                "body": _json_encoder.encode({"message": "Missing audioFile filename"})
+            }
+
+        file_content_type = audio_file.get('contentType', 'audio/mpeg')
+        if file_content_type not in ALLOWED_FILE_TYPES:
+            return {
+                "statusCode": 400,
+                'headers': _CORS_HEADERS,
+                "body": _json_encoder.encode({"message": f"Unsupported audio file type: {file_content_type}"})
+            }
+
+        if cover_image:
+            image_content_type = cover_image.get('contentType', '')
+            if image_content_type not in ALLOWED_IMAGE_TYPES:
+                return {
+                    "statusCode": 400,
+                    'headers': _CORS_HEADERS,
+                    "body": _json_encoder.encode({"message": f"Unsupported cover image file type: {image_content_type}"})
+                }
+
+        content_id = uuid7()
+        file_key = f"music-content/{content_id}/{filename}"
+
+        response_data = {
+            "contentId": content_id,
+            "expiresIn": UPLOAD_URL_EXPIRY,
+            "audioUpload": _generate_upload_form(file_key, file_content_type, MAX_FILE_SIZE, content_id, filename)
+        }
+
+        if cover_image:
+            cover_filename = cover_image.get('filename') or ''
+            image_extension = get_file_extension(cover_filename, image_content_type)
+            cover_image_key = f"music-content/{content_id}/cover{image_extension}"
+            response_data["coverImageUpload"] = _generate_upload_form(
+                cover_image_key, image_content_type, MAX_IMAGE_SIZE, content_id, cover_filename,
+                cache_control=COVER_IMAGE_CACHE_CONTROL
+            )
+
+        return {
+            "statusCode": 200,
+            'headers': _CORS_HEADERS,
+            "body": _json_encoder.encode(response_data)
+        }
+    except json.JSONDecodeError:
+        return {
+            "statusCode": 400,
+            'headers': _CORS_HEADERS,
+            "body": _json_encoder.encode({"message": "Invalid JSON in request body"})
+        }
+    except Exception:
+        logger.exception("Init upload failed")
+        return {
+            "statusCode": 500,
+            'headers': _CORS_HEADERS,
+            "body": _json_encoder.encode({"message": "Internal server error"})
+        }
+
+def _generate_upload_form(key, content_type, max_size, content_id, original_filename, cache_control=None):
+    """Presigned POST (url + form fields) limited to one key, type and size range"""
+    fields = {
+        'Content-Type': content_type,
+        'x-amz-meta-contentid': content_id,
+        'x-amz-meta-originalfilename': original_filename
+    }
+    if cache_control:
+        fields['Cache-Control'] = cache_control
+    conditions = [['content-length-range', 1, max_size]]
+    conditions.extend({name: value} for name, value in fields.items())
+    presigned = s3_client.generate_presigned_post(
+        Bucket=BUCKET_NAME,
+        Key=key,
+        Fields=fields,
+        Conditions=conditions,
+        ExpiresIn=UPLOAD_URL_EXPIRY
+    )
+    return {'url': presigned['url'], 'fields': presigned['fields']}
+
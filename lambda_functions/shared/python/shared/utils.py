@@ -0,0 +1,122 @@
+"""
+Helpers shared by the music app Lambda functions
+Deployed as the shared Lambda layer, so handlers import them with
+`from shared.utils import ...`
+"""
+import json
+import logging
+import os
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Namespace for the EMF counters written by emit_count_metric
+METRIC_NAMESPACE = 'MusicApp'
+FUNCTION_NAME = os.environ.get('AWS_LAMBDA_FUNCTION_NAME', '')
+
+# Common genre variations and typos mapped to their canonical name
+GENRE_MAPPINGS = {
+    'r&b': 'rnb',
+    'rhythm and blues': 'rnb',
+    'hip-hop': 'hiphop',
+    'hip hop': 'hiphop',
+    'drum and bass': 'drumnbass',
+    'drum & bass': 'drumnbass',
+    'electronic dance music': 'edm',
+    'singer-songwriter': 'singersongwriter',
+    'alt-rock': 'alternative',
+    'alternative rock': 'alternative',
+    'heavy metal': 'metal',
+    'death metal': 'metal',
+    'black metal': 'metal',
+    'thrash metal': 'metal'
+}
+
+# Lifetime of the presigned cover URL stored with music content. The URL is
+# stable for that whole time, so browsers may cache the image as long. Not
+# 'immutable' - update_music_content rewrites the same key
+COVER_IMAGE_URL_EXPIRY = 604800 # 1 week
+COVER_IMAGE_CACHE_CONTROL = f'private, max-age={COVER_IMAGE_URL_EXPIRY}'
+
+# Genre registry item whose counter discover uses to invalidate its cache
+GENRE_REGISTRY_VERSION_KEY = {'entityType': 'registry', 'genre': 'version'}
+
+def uuid7():
+    """
+    Time-ordered UUIDv7: a 48-bit millisecond timestamp followed by random
+    bits, so IDs sort by creation time while keeping the standard UUID format.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), 'big')
+    value = (value & ~(0xF << 76)) | (0x7 << 76) # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62) # RFC 4122 variant
+    return str(uuid.UUID(int=value))
+
+def normalize_genre(genre):
+    """
+    DISCOVER OPTIMIZATION: Normalize genre names for consistent filtering
+    This ensures that "Rock", "rock", "ROCK" are all stored as "rock"
+    """
+    if not genre or not isinstance(genre, str):
+        return 'unknown'
+
+    normalized = genre.lower().strip()
+    # Every mapped variant contains a space or punctuation - plain words map to themselves
+    if normalized.isalpha():
+        return normalized
+    return GENRE_MAPPINGS.get(normalized, normalized)
+
+def get_file_extension(filename, content_type):
+    """Extension for a stored cover image - from its content type, else the uploaded filename"""
+    if content_type == 'image/jpeg':
+        return '.jpg'
+    elif content_type == 'image/png':
+        return '.png'
+    elif content_type == 'image/webp':
+        return '.webp'
+    else:
+        return '.' + filename.split('.')[-1] if '.' in filename else '.jpg'
+
+def register_genres(registry_table, entity_type, genres):
+    """
+    Record genres in the registry discover lists genres from, and bump the
+    registry version so discover drops its cached genre counts.
+    Best effort - the item is already stored, so a failure is only logged.
+    """
+    try:
+        with registry_table.batch_writer() as batch:
+            for genre in genres:
+                batch.put_item(Item={'entityType': entity_type, 'genre': genre})
+        _increment_genre_registry_version(registry_table)
+    except Exception:
+        logger.exception("Genre registration failed")
+
+def bump_genre_registry_version(registry_table):
+    """Bump the registry version so discover recounts - failures are logged, not raised"""
+    try:
+        _increment_genre_registry_version(registry_table)
+    except Exception:
+        logger.exception("Genre registry version bump failed")
+
+def _increment_genre_registry_version(registry_table):
+    registry_table.update_item(
+        Key=GENRE_REGISTRY_VERSION_KEY,
+        UpdateExpression='ADD #version :one',
+        ExpressionAttributeNames={'#version': 'version'},
+        ExpressionAttributeValues={':one': 1}
+    )
+
+def emit_count_metric(name, count=1):
+    """Write a Count metric as a CloudWatch EMF line - print, since the logging handler prefixes records"""
+    print(json.dumps({
+        '_aws': {
+            'Timestamp': int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': METRIC_NAMESPACE,
+                'Dimensions': [['FunctionName']],
+                'Metrics': [{'Name': name, 'Unit': 'Count'}]
+            }]
+        },
+        'FunctionName': FUNCTION_NAME,
+        name: count
+    }, separators=(',', ':')))
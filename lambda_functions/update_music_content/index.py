@@ -6,6 +6,7 @@ from decimal import Decimal
 import base64
 import uuid
 import json
+from shared.utils import get_file_extension, register_genres
 
 dynamodb = boto3.resource('dynamodb')
 s3_client = boto3.client('s3')
@@ -110,6 +111,8 @@ def _handle_json_update(event, table):
             updated_item = response["Attributes"]
             updated_item = json.loads(json.dumps(updated_item, default=decimal_converter))
             print(f"Succcessfully updated item: {content_id}")
+            if ':genre' in expression_attribute_values:
+                _register_genre(expression_attribute_values[':genre'])
             return {
                 "statusCode": 200,
                 'headers': get_cors_headers(),
@@ -244,7 +247,7 @@ def _handle_mutipart_update(event, table, bucket_name):
             })
         # If cover image was updated, update related fields
         if cover_image_part:
-            image_extension = _get_file_extension(cover_image_part['filename'], cover_image_part.get('content_type', 'image/jpeg'))
+            image_extension = get_file_extension(cover_image_part['filename'], cover_image_part.get('content_type', 'image/jpeg'))
             cover_image_s3_key = f"music-content/{content_id}/cover{image_extension}"
 
             cover_image_url = s3_client.generate_presigned_url(
@@ -292,6 +295,8 @@ def _handle_mutipart_update(event, table, bucket_name):
 
         updated_item = response["Attributes"]
         updated_item = json.loads(json.dumps(updated_item, default=decimal_converter))
+        if ':genre' in expression_attribute_values:
+            _register_genre(expression_attribute_values[':genre'])
 
         return {
             "statusCode": 200,
@@ -375,7 +380,7 @@ def _update_cover_image(part, existing_item, bucket_name):
             return {'error': f"Image file size exceeds the maximum limit of {max_image_size} bytes"}
         
         content_id = existing_item['contentId']
-        image_extension = _get_file_extension(part['filename'], image_content_type)
+        image_extension = get_file_extension(part['filename'], image_content_type)
         new_s3_key = f"music-content/{content_id}/cover{image_extension}"
         # Deleting old cover image from S3 if exists
         old_s3_key = existing_item.get('coverImageS3Key')
@@ -405,16 +410,6 @@ def _update_cover_image(part, existing_item, bucket_name):
         print(f"Error updating cover image: {str(e)}")
         return {'error': "Error uploading cover image"}
 
-def _get_file_extension(filename, content_type):
-    if content_type == 'image/jpeg':
-        return '.jpg'
-    elif content_type == 'image/png':
-        return '.png'
-    elif content_type == 'image/webp':
-        return '.webp'
-    else:
-        return '.' + filename.split('.')[-1] if '.' in filename else '.jpg'
-
 def _parse_multipart(body, boundary):
     parts = []
     boundary_bytes = f'--{boundary}'.encode('utf-8')
@@ -460,6 +455,12 @@ def _parse_multipart(body, boundary):
 
     return parts
 
+def _register_genre(genre):
+    """Make an updated genre listable by discover (best effort)"""
+    if isinstance(genre, str) and genre.strip():
+        # Same normalisation discover applies to the genres it reads
+        register_genres(dynamodb.Table(os.environ['GENRE_REGISTRY_TABLE']), 'music', [genre.lower().strip()])
+
 def decimal_converter(obj):
     if isinstance(obj, Decimal):
         return float(obj)
@@ -471,11 +472,10 @@ def is_admin_user(event):
         request_context = event.get('requestContext', {})
         authorizer = request_context.get('authorizer', {})
         
-        # Check if user is in administrators group
-        groups = authorizer.get('groups', '').split(',')
-        role = authorizer.get('role', '')
-        
-        return 'administrators' in groups or role == 'admin'
+        # Role is a single string compare - only split the groups list when it is not admin
+        if authorizer.get('role') == 'admin':
+            return True
+        return 'administrators' in authorizer.get('groups', '').split(',')
         
     except Exception as e:
         print(f"Error checking admin role: {str(e)}")
@@ -28,7 +28,9 @@ class UserLambdas(Construct):
         transcriptions_table,  
         transcription_queue,
         feed_table,
-        feed_queue
+        feed_queue,
+        artist_names_table,
+        genre_registry_table
     ):
         super().__init__(scope, id)
         
@@ -47,6 +49,11 @@ class UserLambdas(Construct):
         self.transcription_queue = transcription_queue
         self.feed_table = feed_table
         self.feed_queue = feed_queue
+        self.artist_names_table = artist_names_table
+        self.genre_registry_table = genre_registry_table
+        
+        print(f"Creating shared helpers Lambda layer...")
+        self.shared_layer = self._create_shared_layer()
         
         print(f"Creating registration Lambda function...")
         self.registration_function = self._create_registration_function()
@@ -125,11 +132,26 @@ class UserLambdas(Construct):
         print(f"Creating create music content Lambda function...")
         self.create_music_content_function = self._create_create_music_content_function()
 
+        print(f"Creating direct upload Lambda functions...")
+        self.init_upload_function = self._create_init_upload_function()
+        self.finalize_upload_function = self._create_finalize_upload_function()
+
         self.add_to_history_function = self._create_add_to_history_function()
 
         # Grant permissions (includes new album functions)
         self._grant_permissions()
     
+    def _create_shared_layer(self) -> _lambda.LayerVersion:
+        """Helpers shared by several functions - importable as shared.utils"""
+        return _lambda.LayerVersion(
+            self,
+            "SharedLayer",
+            layer_version_name=f"{self.config.app_name}-Shared",
+            code=_lambda.Code.from_asset("lambda_functions/shared"),
+            compatible_runtimes=[_lambda.Runtime.PYTHON_3_9],
+            description="Shared helpers for the music app Lambda functions"
+        )
+
     def _create_registration_function(self) -> _lambda.Function:
         """Your existing _create_registration_function method"""
         
@@ -219,11 +241,14 @@ class UserLambdas(Construct):
             runtime=_lambda.Runtime.PYTHON_3_9,
             handler="index.handler",
             code=_lambda.Code.from_asset("lambda_functions/create_artist"),
+            layers=[self.shared_layer],
             timeout=Duration.seconds(self.config.lambda_timeout),
             memory_size=self.config.lambda_memory,
             tracing=_lambda.Tracing.ACTIVE if self.config.enable_x_ray_tracing else _lambda.Tracing.DISABLED,
             environment={
                 'ARTISTS_TABLE': self.artists_table.table_name,
+                'ARTIST_NAMES_TABLE': self.artist_names_table.table_name,
+                'GENRE_REGISTRY_TABLE': self.genre_registry_table.table_name,
                 'APP_NAME': self.config.app_name
             }
         )
@@ -376,6 +401,7 @@ class UserLambdas(Construct):
             runtime=_lambda.Runtime.PYTHON_3_9,
             handler="index.handler",
             code=_lambda.Code.from_asset("lambda_functions/create_rating"),
+            layers=[self.shared_layer],
             timeout=Duration.seconds(self.config.lambda_timeout),
             memory_size=self.config.lambda_memory,
             tracing=_lambda.Tracing.ACTIVE if self.config.enable_x_ray_tracing else _lambda.Tracing.DISABLED,
@@ -396,6 +422,7 @@ class UserLambdas(Construct):
             runtime=_lambda.Runtime.PYTHON_3_9,
             handler="index.handler",
             code=_lambda.Code.from_asset("lambda_functions/create_subscription"),
+            layers=[self.shared_layer],
             timeout=Duration.seconds(self.config.lambda_timeout),
             memory_size=self.config.lambda_memory,
             tracing=_lambda.Tracing.ACTIVE if self.config.enable_x_ray_tracing else _lambda.Tracing.DISABLED,
@@ -469,6 +496,7 @@ class UserLambdas(Construct):
             runtime=_lambda.Runtime.PYTHON_3_9,
             handler="index.handler",
             code=_lambda.Code.from_asset("lambda_functions/create_music_content"),
+            layers=[self.shared_layer],
             timeout=Duration.seconds(self.config.lambda_timeout),
             memory_size=self.config.lambda_memory,
             tracing=_lambda.Tracing.ACTIVE if self.config.enable_x_ray_tracing else _lambda.Tracing.DISABLED,
@@ -481,10 +509,55 @@ class UserLambdas(Construct):
                 'MAX_IMAGE_SIZE': str(self.config.max_image_size),
                 'ARTISTS_TABLE': self.artists_table.table_name, 
                 'ALBUMS_TABLE': self.albums_table.table_name,
+                'GENRE_REGISTRY_TABLE': self.genre_registry_table.table_name,
                 'START_TRANSCRIPTION_FUNCTION': f"{self.config.app_name}-StartTranscription" 
             }
         )
 
+    def _create_init_upload_function(self) -> _lambda.Function:
+        """Issues presigned POST forms so files go from the browser straight to S3"""
+        return _lambda.Function(
+            self,
+            "InitUploadFunction",
+            function_name=f"{self.config.app_name}-InitUpload",
+            runtime=_lambda.Runtime.PYTHON_3_9,
+            handler="index.handler",
+            code=_lambda.Code.from_asset("lambda_functions/init_upload"),
+            layers=[self.shared_layer],
+            timeout=Duration.seconds(self.config.lambda_timeout),
+            memory_size=self.config.lambda_memory,
+            tracing=_lambda.Tracing.ACTIVE if self.config.enable_x_ray_tracing else _lambda.Tracing.DISABLED,
+            environment={
+                'MUSIC_CONTENT_BUCKET': self.config.music_bucket_name,
+                'MAX_FILE_SIZE': str(self.config.max_file_size),
+                'ALLOWED_FILE_TYPES': ','.join(self.config.allowed_file_types),
+                'ALLOWED_IMAGE_TYPES': ','.join(self.config.allowed_image_types),
+                'MAX_IMAGE_SIZE': str(self.config.max_image_size)
+            }
+        )
+
+    def _create_finalize_upload_function(self) -> _lambda.Function:
+        """Records music content after a direct-to-S3 upload has completed"""
+        return _lambda.Function(
+            self,
+            "FinalizeUploadFunction",
+            function_name=f"{self.config.app_name}-FinalizeUpload",
+            runtime=_lambda.Runtime.PYTHON_3_9,
+            handler="index.handler",
+            code=_lambda.Code.from_asset("lambda_functions/finalize_upload"),
+            layers=[self.shared_layer],
+            timeout=Duration.seconds(self.config.lambda_timeout),
+            memory_size=self.config.lambda_memory,
+            tracing=_lambda.Tracing.ACTIVE if self.config.enable_x_ray_tracing else _lambda.Tracing.DISABLED,
+            environment={
+                'MUSIC_CONTENT_TABLE': self.music_content_table.table_name,
+                'MUSIC_CONTENT_BUCKET': self.config.music_bucket_name,
+                'ALLOWED_FILE_TYPES': ','.join(self.config.allowed_file_types),
+                'ALLOWED_IMAGE_TYPES': ','.join(self.config.allowed_image_types),
+                'GENRE_REGISTRY_TABLE': self.genre_registry_table.table_name
+            }
+        )
+
     def _create_update_music_content_function(self) -> _lambda.Function:
         return _lambda.Function(
             self,
@@ -493,6 +566,7 @@ class UserLambdas(Construct):
             runtime=_lambda.Runtime.PYTHON_3_9,
             handler="index.handler",
             code=_lambda.Code.from_asset("lambda_functions/update_music_content"),
+            layers=[self.shared_layer],
             timeout=Duration.seconds(self.config.lambda_timeout),
             memory_size=self.config.lambda_memory,
             tracing=_lambda.Tracing.ACTIVE if self.config.enable_x_ray_tracing else _lambda.Tracing.DISABLED,
@@ -502,7 +576,8 @@ class UserLambdas(Construct):
                 'MAX_FILE_SIZE': str(self.config.max_file_size),
                 'ALLOWED_FILE_TYPES': ','.join(self.config.allowed_file_types),
                 'ALLOWED_IMAGE_TYPES': ','.join(self.config.allowed_image_types),
-                'MAX_IMAGE_SIZE': str(self.config.max_image_size)
+                'MAX_IMAGE_SIZE': str(self.config.max_image_size),
+                'GENRE_REGISTRY_TABLE': self.genre_registry_table.table_name
             }
         )
 
@@ -575,12 +650,14 @@ class UserLambdas(Construct):
             runtime=_lambda.Runtime.PYTHON_3_9,
             handler="index.handler",
             code=_lambda.Code.from_asset("lambda_functions/delete_music_content"),
+            layers=[self.shared_layer],
             timeout=Duration.seconds(self.config.lambda_timeout),
             memory_size=self.config.lambda_memory,
             tracing=_lambda.Tracing.ACTIVE if self.config.enable_x_ray_tracing else _lambda.Tracing.DISABLED,
             environment={
                 'MUSIC_CONTENT_TABLE': self.music_content_table.table_name,
-                'MUSIC_CONTENT_BUCKET': self.config.music_bucket_name
+                'MUSIC_CONTENT_BUCKET': self.config.music_bucket_name,
+                'GENRE_REGISTRY_TABLE': self.genre_registry_table.table_name
             }
         )
 
@@ -603,6 +680,7 @@ class UserLambdas(Construct):
                 'MUSIC_CONTENT_TABLE': self.music_content_table.table_name,
                 'ARTISTS_TABLE': self.artists_table.table_name,
                 'ALBUMS_TABLE': self.albums_table.table_name,  # NEW: Albums table for discover
+                'GENRE_REGISTRY_TABLE': self.genre_registry_table.table_name,
                 'APP_NAME': self.config.app_name
             }
         )
@@ -618,12 +696,14 @@ class UserLambdas(Construct):
             runtime=_lambda.Runtime.PYTHON_3_9,
             handler="index.handler",
             code=_lambda.Code.from_asset("lambda_functions/create_album"),
+            layers=[self.shared_layer],
             timeout=Duration.seconds(self.config.lambda_timeout),
             memory_size=self.config.lambda_memory,
             tracing=_lambda.Tracing.ACTIVE if self.config.enable_x_ray_tracing else _lambda.Tracing.DISABLED,
             environment={
                 'ALBUMS_TABLE': self.albums_table.table_name,
                 'ARTISTS_TABLE': self.artists_table.table_name,  # For artist verification
+                'GENRE_REGISTRY_TABLE': self.genre_registry_table.table_name,
                 'APP_NAME': self.config.app_name
             }
         )
@@ -773,6 +853,7 @@ class UserLambdas(Construct):
         self.users_table.grant_read_data(self.calculate_feed_function)
         self.users_table.grant_read_data(self.get_music_content_function)
         self.artists_table.grant_read_write_data(self.create_artist_function)
+        self.artist_names_table.grant_read_write_data(self.create_artist_function)
         self.ratings_table.grant_read_write_data(self.create_rating_function)
         self.subscriptions_table.grant_read_write_data(self.create_subscription_function)
         self.artists_table.grant_read_data(self.get_artists_function)
@@ -798,6 +879,7 @@ class UserLambdas(Construct):
         self.albums_table.grant_read_data(self.add_to_history_function)
 
         self.music_content_table.grant_read_write_data(self.create_music_content_function)
+        self.music_content_table.grant_write_data(self.finalize_upload_function)
         self.music_content_table.grant_read_write_data(self.update_music_content_function)
         self.music_content_table.grant_read_data(self.get_music_content_function)
 
@@ -812,6 +894,9 @@ class UserLambdas(Construct):
 
         # S3 permissions
         self.music_bucket.grant_read_write(self.create_music_content_function)
+        # Presigned POSTs are signed with the init function's role, so it needs put access
+        self.music_bucket.grant_put(self.init_upload_function)
+        self.music_bucket.grant_read(self.finalize_upload_function)
         self.music_bucket.grant_read(self.get_music_content_function)
         self.music_bucket.grant_read_write(self.delete_music_content_function)
         self.music_bucket.grant_read_write(self.update_music_content_function)
@@ -825,6 +910,14 @@ class UserLambdas(Construct):
         self.music_content_table.grant_read_data(self.discover_function)
         self.artists_table.grant_read_data(self.discover_function)
         self.albums_table.grant_read_data(self.discover_function)  # NEW: Albums read access
+        # Discover backfills the registry from the tables the first time it is empty
+        self.genre_registry_table.grant_read_write_data(self.discover_function)
+        self.genre_registry_table.grant_write_data(self.create_music_content_function)
+        self.genre_registry_table.grant_write_data(self.finalize_upload_function)
+        self.genre_registry_table.grant_write_data(self.update_music_content_function)
+        self.genre_registry_table.grant_write_data(self.create_artist_function)
+        self.genre_registry_table.grant_write_data(self.create_album_function)
+        self.genre_registry_table.grant_write_data(self.delete_music_content_function)  # Version bump only
         
         # Create music content needs access to albums for relationship updates
         self.albums_table.grant_read_write_data(self.create_music_content_function)  # NEW: For album metadata updates
@@ -46,7 +46,9 @@ class MusicAppStack(Stack):
             database.transcriptions_table,
             transcription.transcription_queue,
             database.feed_table,
-            feed.feed_queue
+            feed.feed_queue,
+            database.artist_names_table,
+            database.genre_registry_table
         )
         
         api = ApiConstruct(
@@ -78,7 +80,9 @@ class MusicAppStack(Stack):
             user_lambdas.get_albums_function,     
             user_lambdas.add_to_history_function,
             user_lambdas.get_transcription_function,
-            user_lambdas.get_feed_function
+            user_lambdas.get_feed_function,
+            user_lambdas.init_upload_function,
+            user_lambdas.finalize_upload_function
         )
         
         # Step 5: Create outputs
@@ -0,0 +1,69 @@
+import importlib.util
+import json
+import os
+import sys
+
+import pytest
+from botocore.awsrequest import AWSResponse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+LAMBDA_DIR = os.path.join(ROOT, 'lambda_functions')
+
+# The shared layer is mounted under /opt/python in Lambda
+sys.path.insert(0, os.path.join(LAMBDA_DIR, 'shared', 'python'))
+
+# Handlers read their configuration at import time
+os.environ.update({
+    'AWS_DEFAULT_REGION': 'eu-central-1',
+    'AWS_ACCESS_KEY_ID': 'testing',
+    'AWS_SECRET_ACCESS_KEY': 'testing',
+    'SUBSCRIPTIONS_TABLE': 'Subscriptions',
+    'CALCULATE_FEED_FUNCTION': 'CalculateFeed',
+    'MUSIC_CONTENT_TABLE': 'MusicContent',
+    'ARTISTS_TABLE': 'Artists',
+    'ALBUMS_TABLE': 'Albums',
+    'GENRE_REGISTRY_TABLE': 'GenreRegistry',
+})
+
+
+def load_lambda(name):
+    """Import lambda_functions/<name>/index.py - every handler module is called index"""
+    spec = importlib.util.spec_from_file_location(
+        f'{name}_index', os.path.join(LAMBDA_DIR, name, 'index.py')
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class _RawBody:
+    def __init__(self, body):
+        self._body = body
+
+    def stream(self, **kwargs):
+        yield self._body
+
+
+class WireStub:
+    """
+    Answers a botocore client's requests with canned JSON responses, after the
+    client has serialized them, and records each request body as sent on the wire
+    """
+
+    def __init__(self, client):
+        self.requests = []
+        self._responses = []
+        client.meta.events.register_first('before-send.*.*', self._send)
+
+    def add_response(self, body):
+        self._responses.append(body)
+
+    def _send(self, request, **kwargs):
+        self.requests.append(json.loads(request.body))
+        body = json.dumps(self._responses.pop(0)).encode('utf-8')
+        return AWSResponse(request.url, 200, {}, _RawBody(body))
+
+
+@pytest.fixture
+def wire_stub():
+    return WireStub
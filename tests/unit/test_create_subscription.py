@@ -0,0 +1,29 @@
+from tests.unit.conftest import load_lambda
+
+create_subscription = load_lambda('create_subscription')
+
+
+def test_store_subscription_sends_hand_marshalled_item_unchanged(wire_stub):
+    query_stub = wire_stub(create_subscription.dynamodb.meta.client)
+    query_stub.add_response({'Items': [], 'Count': 0})
+    put_stub = wire_stub(create_subscription.dynamodb_client)
+    put_stub.add_response({})
+
+    stored = create_subscription.store_subscription({
+        'subscriptionId': 'sub-1',
+        'username': 'ana',
+        'subscriptionType': 'GENRE',
+        'targetId': None,
+        'targetName': 'rock',
+        'timestamp': '2024-01-01T00:00:00Z'
+    })
+
+    assert stored is True
+    assert put_stub.requests[0]['Item'] == {
+        'subscriptionId': {'S': 'sub-1'},
+        'username': {'S': 'ana'},
+        'subscriptionType': {'S': 'GENRE'},
+        'targetId': {'NULL': True},
+        'targetName': {'S': 'rock'},
+        'timestamp': {'S': '2024-01-01T00:00:00Z'}
+    }
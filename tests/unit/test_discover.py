@@ -0,0 +1,33 @@
+from tests.unit.conftest import load_lambda
+
+discover = load_lambda('discover')
+
+
+def test_genre_query_round_trips_raw_attribute_values(wire_stub):
+    stub = wire_stub(discover.dynamodb_client)
+    stub.add_response({
+        'Items': [{
+            'contentId': {'S': 'c-1'},
+            'title': {'S': 'Song'},
+            'genre': {'S': 'rock'},
+            'trackNumber': {'N': '3'}
+        }],
+        'LastEvaluatedKey': {'contentId': {'S': 'c-1'}, 'genre': {'S': 'rock'}}
+    })
+
+    result = discover.query_content_by_genre_chronological(
+        discover.music_content_table, 'rock', 10, None, 'newest'
+    )
+
+    assert stub.requests[0]['ExpressionAttributeValues'] == {':genre': {'S': 'rock'}}
+    assert result['content'][0]['title'] == 'Song'
+    assert result['content'][0]['trackNumber'] == 3
+    assert result['content'][0]['album'] is None
+    assert discover.decode_last_key(result['lastKey']) == {'contentId': 'c-1', 'genre': 'rock'}
+
+    # The token goes back to DynamoDB as the same low-level key
+    stub.add_response({'Items': []})
+    discover.query_content_by_genre_chronological(
+        discover.music_content_table, 'rock', 10, result['lastKey'], 'newest'
+    )
+    assert stub.requests[1]['ExclusiveStartKey'] == {'contentId': {'S': 'c-1'}, 'genre': {'S': 'rock'}}